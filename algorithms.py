@@ -1,321 +1,379 @@
 # algorithms.py
 
-import pygame
-from queue import PriorityQueue
-from collections import deque
-import time
+import search
+import replanner
+import hierarchical
+from grid import Grid
+from moves import FOUR
+from search import SearchObserver
 
+# Strategy methods compared by the multi-algorithm modes
+ALGORITHMS = [
+    "a_star", "dijkstra", "bfs", "dfs", "greedy_bfs", "jps",
+    "bidirectional_bfs", "bidirectional_a_star", "hpa_star",
+]
 
-def h(p1, p2):
+
+class SpotObserver(SearchObserver):
+    """
+    Mirrors search progress onto a grid of Spot objects and redraws the window.
+
+    Attributes:
+        grid (list): 2D list of Spot objects representing the grid.
+        draw (function): A function to update the drawing for visualization.
+        start (Spot): Starting node, never recolored.
+        end (Spot | list): Goal node, or list of goal nodes, never recolored.
     """
-    Heuristic function for pathfinding.
+
+    def __init__(self, grid, draw, start, end):
+        """
+        Initializes a SpotObserver.
+
+        Args:
+            grid (list): 2D list of Spot objects representing the grid.
+            draw (function): A function to update the drawing for visualization.
+            start (Spot): Starting node.
+            end (Spot | list): Goal node, or list of goal nodes for multi-goal searches.
+        """
+        import pygame  # Only visual runs need pygame, so headless imports of this module never load it
+        self.pygame = pygame
+        self.grid = grid
+        self.draw = draw
+        self.start = start
+        self.end = end
+        self.goals = set(end) if isinstance(end, list) else {end}
+
+    def spot(self, index):
+        """
+        Gets the Spot at a flat cell index.
+
+        Args:
+            index (int): The flat index.
+
+        Returns:
+            Spot: The Spot at that index.
+        """
+        row, col = divmod(index, len(self.grid[0]))
+        return self.grid[row][col]
+
+    def on_open(self, index):
+        spot = self.spot(index)
+        if spot not in self.goals:
+            spot.make_open()
+
+    def on_close(self, index):
+        pygame = self.pygame
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+
+        self.draw()
+        spot = self.spot(index)
+        if spot is not self.start:
+            spot.make_closed()
+
+    def on_path(self, path):
+        # Trace back from the end like the original reconstruct_path did
+        for row, col in reversed(path[:-1]):
+            self.grid[row][col].make_path()
+            self.draw()
+
+
+def position(node):
+    """
+    Gets the position of a node.
 
     Args:
-        p1 (tuple): Coordinates of the first point (x1, y1).
-        p2 (tuple): Coordinates of the second point (x2, y2).
+        node (Spot | tuple): A Spot or a (row, col) position.
 
     Returns:
-        int: The Manhattan distance between the two points.
+        tuple: The (row, col) position.
     """
-    x1, y1 = p1
-    x2, y2 = p2
-    return abs(x1 - x2) + abs(y1 - y2)
+    return node if isinstance(node, tuple) else node.get_pos()
 
 
-def reconstruct_path(came_from, current, draw):
+def run(search_fn, draw, grid, start, end, layout=None, **options):
     """
-    Reconstructs the path from the end node to the start node.
+    Runs a headless search, visualizing it if a draw function is given.
 
     Args:
-        came_from (dict): A dictionary mapping nodes to their parent nodes.
-        current (Spot): The current node to trace back from.
-        draw (function): A function to update the drawing for visualization.
+        search_fn (function): A search function from the search module.
+        draw (function): A function to update the drawing, or None to run headless.
+        grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+        start (Spot | tuple): Starting node or (row, col) position.
+        end (Spot | tuple): Goal node or (row, col) position.
+        layout (Grid): Optional Grid kept in sync with the Spots. It is searched instead
+            of a Grid rebuilt from the Spots, so its cached indexes carry over between runs.
+        **options: Extra keyword arguments for the search, such as moves.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    start_pos = position(start)
+    end_pos = position(end)
+
+    # A Grid has no Spots to recolor, so it is always searched headless;
+    # build Spots from it with Game.make_grid to watch the search.
+    if isinstance(grid, Grid):
+        return search_fn(grid, start_pos, end_pos, **options)
+
+    if layout is None:
+        layout = Grid.from_spots(grid)
+    observer = SpotObserver(grid, draw, start, end) if draw else search.HEADLESS
+    return search_fn(layout, start_pos, end_pos, observer, **options)
+
+
+def run_goals(search_fn, draw, grid, start, ends, layout=None, **options):
+    """
+    Like run(), for searches that take several goals.
+
+    Args:
+        search_fn (function): A multi-goal search function from the search module.
+        draw (function): A function to update the drawing, or None to run headless.
+        grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+        start (Spot | tuple): Starting node or (row, col) position.
+        ends (iterable): Goal nodes or (row, col) positions.
+        layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+        **options: Extra keyword arguments for the search, such as algorithm and moves.
 
     Returns:
-        None
+        object: Whatever search_fn returns.
     """
-    while current in came_from:
-        current = came_from[current]
-        current.make_path()
-        draw()
+    ends = list(ends)
+    goals = [position(end) for end in ends]
+    if isinstance(grid, Grid):
+        return search_fn(grid, position(start), goals, **options)
+
+    if layout is None:
+        layout = Grid.from_spots(grid)
+    observer = SpotObserver(grid, draw, start, ends) if draw else search.HEADLESS
+    return search_fn(layout, position(start), goals, observer, **options)
 
 
 class Strategy:
     """
     A collection of static methods for various pathfinding algorithms.
+
+    The searches themselves live in the pygame-free search module; these methods
+    adapt a grid of Spot objects to it and visualize progress through draw().
     """
 
     @staticmethod
-    def a_star(draw, grid, start, end):
+    def a_star(draw, grid, start, end, layout=None, moves=FOUR):
         """
         A* pathfinding algorithm with visualization and metrics collection.
 
         Args:
-            draw (function): A function to update the drawing for visualization.
-            grid (list): 2D list of Spot objects representing the grid.
-            start (Spot): Starting node.
-            end (Spot): Goal node.
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+            moves (Moves): Movement model and heuristic, 4-connected Manhattan by default.
 
         Returns:
             dict: A dictionary containing metrics, or None if no path is found.
         """
-        start_time = time.time()  # Start the timer
-
-        count = 0
-        open_set = PriorityQueue()
-        open_set.put((0, count, start))
-        came_from = {}
-        g_score = {spot: float("inf") for row in grid for spot in row}
-        g_score[start] = 0
-        f_score = {spot: float("inf") for row in grid for spot in row}
-        f_score[start] = h(start.get_pos(), end.get_pos())
-
-        open_set_hash = {start}
-        expanded_nodes = 0  # Counter for expanded nodes
-
-        while not open_set.empty():
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
-            current = open_set.get()[2]
-            open_set_hash.remove(current)
-            expanded_nodes += 1  # Increment expanded node count
-
-            if current == end:
-                end_time = time.time()  # End the timer
-                total_time = end_time - start_time
-
-                # Reconstruct and draw the path
-                reconstruct_path(came_from, end, draw)
-
-                # Metrics
-                path = []
-                while current in came_from:
-                    path.append(current.get_pos())
-                    current = came_from[current]
-                path.append(start.get_pos())
-                path.reverse()
-
-                metrics = {
-                    "path": path,
-                    "time": total_time,
-                    "steps": len(path),
-                    "manhattan_distance": h(start.get_pos(), end.get_pos()),
-                    "expanded_nodes": expanded_nodes,
-                    "algorithm": "A_star"
-                }
-                return metrics  # Return metrics instead of True
-
-            for neighbor in current.neighbors:
-                temp_g_score = g_score[current] + 1
-
-                if temp_g_score < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = temp_g_score
-                    f_score[neighbor] = temp_g_score + h(neighbor.get_pos(), end.get_pos())
-                    if neighbor not in open_set_hash:
-                        count += 1
-                        open_set.put((f_score[neighbor], count, neighbor))
-                        open_set_hash.add(neighbor)
-                        neighbor.make_open()
-
-            draw()
-
-            if current != start:
-                current.make_closed()
-
-        return None  # Return None if no path is found
+        return run(search.a_star, draw, grid, start, end, layout, moves=moves)
 
     @staticmethod
-    def bfs(draw, grid, start, end):
+    def dijkstra(draw, grid, start, end, layout=None, moves=FOUR):
+        """
+        Dijkstra's algorithm with visualization and metrics collection.
+
+        Finds the cheapest path when the layout has per-cell traversal costs.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+            moves (Moves): Movement model and heuristic, 4-connected Manhattan by default.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        return run(search.dijkstra, draw, grid, start, end, layout, moves=moves)
+
+    @staticmethod
+    def bfs(draw, grid, start, end, layout=None):
         """
         Breadth-First Search (BFS) algorithm with visualization and metrics collection.
 
         Args:
-            draw (function): A function to update the drawing for visualization.
-            grid (list): 2D list of Spot objects representing the grid.
-            start (Spot): Starting node.
-            end (Spot): Goal node.
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
 
         Returns:
             dict: A dictionary containing metrics, or None if no path is found.
         """
-        start_time = time.time()
-        queue = deque([start])
-        came_from = {}
-        visited = {spot: False for row in grid for spot in row}
-        visited[start] = True
-        expanded_nodes = 0
-
-        while queue:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
-            current = queue.popleft()
-            expanded_nodes += 1
-
-            if current == end:
-                end_time = time.time()
-                total_time = end_time - start_time
-                reconstruct_path(came_from, end, draw)
-
-                path = []
-                while current in came_from:
-                    path.append(current.get_pos())
-                    current = came_from[current]
-                path.append(start.get_pos())
-                path.reverse()
-
-                metrics = {
-                    "path": path,
-                    "time": total_time,
-                    "steps": len(path),
-                    "manhattan_distance": h(start.get_pos(), end.get_pos()),
-                    "expanded_nodes": expanded_nodes,
-                    "algorithm": "BFS"
-                }
-                return metrics
-
-            for neighbor in current.neighbors:
-                if not visited[neighbor]:
-                    visited[neighbor] = True
-                    came_from[neighbor] = current
-                    queue.append(neighbor)
-                    neighbor.make_open()
-
-            draw()
-            if current != start:
-                current.make_closed()
-
-        return None
+        return run(search.bfs, draw, grid, start, end, layout)
 
     @staticmethod
-    def dfs(draw, grid, start, end):
+    def dfs(draw, grid, start, end, layout=None):
         """
         Depth-First Search (DFS) algorithm with visualization and metrics collection.
 
         Args:
-            draw (function): A function to update the drawing for visualization.
-            grid (list): 2D list of Spot objects representing the grid.
-            start (Spot): Starting node.
-            end (Spot): Goal node.
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
 
         Returns:
             dict: A dictionary containing metrics, or None if no path is found.
         """
-        start_time = time.time()
-        stack = [start]
-        came_from = {}
-        visited = {spot: False for row in grid for spot in row}
-        visited[start] = True
-        expanded_nodes = 0
-
-        while stack:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
-            current = stack.pop()
-            expanded_nodes += 1
-
-            if current == end:
-                end_time = time.time()
-                total_time = end_time - start_time
-                reconstruct_path(came_from, end, draw)
-
-                path = []
-                while current in came_from:
-                    path.append(current.get_pos())
-                    current = came_from[current]
-                path.append(start.get_pos())
-                path.reverse()
-
-                metrics = {
-                    "path": path,
-                    "time": total_time,
-                    "steps": len(path),
-                    "manhattan_distance": h(start.get_pos(), end.get_pos()),
-                    "expanded_nodes": expanded_nodes,
-                    "algorithm": "DFS"
-                }
-                return metrics
-
-            for neighbor in current.neighbors:
-                if not visited[neighbor]:
-                    visited[neighbor] = True
-                    came_from[neighbor] = current
-                    stack.append(neighbor)
-                    neighbor.make_open()
-
-            draw()
-            if current != start:
-                current.make_closed()
-
-        return None
+        return run(search.dfs, draw, grid, start, end, layout)
 
     @staticmethod
-    def greedy_bfs(draw, grid, start, end):
+    def greedy_bfs(draw, grid, start, end, layout=None, moves=FOUR):
         """
         Greedy Best-First Search algorithm with visualization and metrics collection.
 
         Args:
-            draw (function): A function to update the drawing for visualization.
-            grid (list): 2D list of Spot objects representing the grid.
-            start (Spot): Starting node.
-            end (Spot): Goal node.
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+            moves (Moves): Movement model and heuristic, 4-connected Manhattan by default.
 
         Returns:
             dict: A dictionary containing metrics, or None if no path is found.
         """
-        start_time = time.time()
-        open_set = PriorityQueue()
-        open_set.put((h(start.get_pos(), end.get_pos()), start))
-        came_from = {}
-        visited = {spot: False for row in grid for spot in row}
-        visited[start] = True
-        expanded_nodes = 0
-
-        while not open_set.empty():
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-
-            current = open_set.get()[1]
-            expanded_nodes += 1
-
-            if current == end:
-                end_time = time.time()
-                total_time = end_time - start_time
-                reconstruct_path(came_from, end, draw)
-
-                path = []
-                while current in came_from:
-                    path.append(current.get_pos())
-                    current = came_from[current]
-                path.append(start.get_pos())
-                path.reverse()
-
-                metrics = {
-                    "path": path,
-                    "time": total_time,
-                    "steps": len(path),
-                    "manhattan_distance": h(start.get_pos(), end.get_pos()),
-                    "expanded_nodes": expanded_nodes,
-                    "algorithm": "Greedy_BFS"
-                }
-                return metrics
-
-            for neighbor in current.neighbors:
-                if not visited[neighbor]:
-                    visited[neighbor] = True
-                    came_from[neighbor] = current
-                    open_set.put((h(neighbor.get_pos(), end.get_pos()), neighbor))
-                    neighbor.make_open()
-
-            draw()
-            if current != start:
-                current.make_closed()
-
-        return None
\ No newline at end of file
+        return run(search.greedy_bfs, draw, grid, start, end, layout, moves=moves)
+
+    @staticmethod
+    def jps(draw, grid, start, end, layout=None):
+        """
+        Jump Point Search (JPS) algorithm with visualization and metrics collection.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        return run(search.jps, draw, grid, start, end, layout)
+
+    @staticmethod
+    def bidirectional_bfs(draw, grid, start, end, layout=None):
+        """
+        Bidirectional Breadth-First Search algorithm with visualization and metrics collection.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        return run(search.bidirectional_bfs, draw, grid, start, end, layout)
+
+    @staticmethod
+    def bidirectional_a_star(draw, grid, start, end, layout=None):
+        """
+        Bidirectional A* algorithm with visualization and metrics collection.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        return run(search.bidirectional_a_star, draw, grid, start, end, layout)
+
+    @staticmethod
+    def lpa_star(draw, grid, start, end, layout=None):
+        """
+        Lifelong Planning A* (LPA*) with visualization and metrics collection.
+
+        Pass the same layout on every call so the planner can reuse its search
+        state and only repair the plan around barriers edited since the last run.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        return run(replanner.lpa_star, draw, grid, start, end, layout)
+
+    @staticmethod
+    def hpa_star(draw, grid, start, end, layout=None):
+        """
+        Hierarchical Path-Finding A* (HPA*) with visualization and metrics collection.
+
+        Searches an abstract graph of cluster entrances, so only the entrances are
+        colored while it runs, then refines the route into a near-optimal path.
+        Pass the same layout on every call to reuse the cluster distances.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            end (Spot | tuple): Goal node or (row, col) position.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        return run(hierarchical.hpa_star, draw, grid, start, end, layout)
+
+    @staticmethod
+    def nearest(draw, grid, start, ends, layout=None, algorithm="a_star", moves=FOUR):
+        """
+        Finds the path to the nearest of several goals with one search, with visualization.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            ends (iterable): Goal nodes or (row, col) positions.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+            algorithm (str): "a_star", "dijkstra" or "bfs".
+            moves (Moves): Movement model for A* and Dijkstra, 4-connected by default.
+
+        Returns:
+            dict: A dictionary containing metrics for the nearest goal, or None if no goal is reachable.
+        """
+        return run_goals(search.nearest_goal, draw, grid, start, ends, layout, algorithm=algorithm, moves=moves)
+
+    @staticmethod
+    def one_to_many(draw, grid, start, ends, layout=None, algorithm="dijkstra", moves=FOUR):
+        """
+        Finds the paths to several goals with one search, with visualization.
+
+        Args:
+            draw (function): A function to update the drawing for visualization, or None.
+            grid (list | Grid): 2D list of Spot objects, or an array-backed Grid.
+            start (Spot | tuple): Starting node or (row, col) position.
+            ends (iterable): Goal nodes or (row, col) positions.
+            layout (Grid): Optional Grid kept in sync with the Spots, searched instead of rebuilding one.
+            algorithm (str): "a_star", "dijkstra" or "bfs".
+            moves (Moves): Movement model for A* and Dijkstra, 4-connected by default.
+
+        Returns:
+            dict: Maps each goal's (row, col) position to its metrics dictionary, or None if unreachable.
+        """
+        return run_goals(search.paths_to_goals, draw, grid, start, ends, layout, algorithm=algorithm, moves=moves)
@@ -0,0 +1,114 @@
+# batch.py
+
+from algorithms import Strategy, ALGORITHMS
+from cache import copy_metrics
+from components import connected
+from distance import distance_field
+from grid import as_grid
+from moves import FOUR
+from search import HEADLESS, Scratch, bfs_paths, cheapest_path, cheapest_paths, make_metrics
+
+# Metrics labels of the searches that run on shared Scratch buffers
+LABELS = {"a_star": "A_star", "dijkstra": "Dijkstra"}
+
+# Metrics labels of the searches that answer a whole group of goals with one run
+GROUPED = {"dijkstra": "Dijkstra", "bfs": "BFS"}
+
+# Batch-only algorithm that answers every goal of a start from one vectorized BFS distance field
+FIELD = "bfs_field"
+
+# Algorithm names run_batch() accepts
+BATCH_ALGORITHMS = ALGORITHMS + [FIELD]
+
+
+def group_by_start(queries):
+    """
+    Groups query pairs by their start position.
+
+    Args:
+        queries (list): (start, end) pairs of (row, col) positions.
+
+    Returns:
+        dict: Maps each start to the list of query numbers that leave from it, in first-seen order.
+    """
+    groups = {}
+    for number, (start, _) in enumerate(queries):
+        groups.setdefault(tuple(start), []).append(number)
+    return groups
+
+
+def run_batch(grid, queries, algorithm="a_star", moves=FOUR, scratch=None):
+    """
+    Answers many (start, end) queries on one grid in one call.
+
+    Queries are grouped by start. A Dijkstra or BFS group is answered by a
+    single search that carries on until all of its reachable goals are
+    expanded. It visits cells in the same order as a search for one goal, so
+    each query gets the same label and expanded nodes as when sent alone.
+    A* stays one goal-directed search per query, which explores far less
+    than one search that has to reach every goal. A* and Dijkstra share one
+    set of Scratch buffers instead of allocating per-cell arrays for each
+    search. FIELD, for many goals around one depot, sweeps a 4-connected
+    distance field from each start once and reads every goal's path off it;
+    all cells reachable from the start count as expanded. Other algorithms
+    run once per query, still reusing the grid's cached component index and
+    lookup tables.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        queries (list): (start, end) pairs of (row, col) positions.
+        algorithm (str): Name of the Strategy method to answer with, or FIELD.
+        moves (Moves): Movement model for A* and Dijkstra, 4-connected by default; the
+            other algorithms only move 4-connected with the Manhattan heuristic.
+        scratch (Scratch): Buffers to reuse across calls on grids of the same size, new ones by default.
+
+    Returns:
+        list: One metrics dictionary per query, in query order, or None where no path exists.
+            Grouped queries report the time and expanded nodes of their shared search
+            up to the moment their goal was reached.
+
+    Raises:
+        ValueError: If moves other than FOUR are given for an algorithm that ignores them.
+    """
+    if algorithm not in LABELS and (moves.connectivity, moves.heuristic) != (FOUR.connectivity, FOUR.heuristic):
+        raise ValueError(f"moves only apply to {' and '.join(LABELS)}, not {algorithm}")
+    grid = as_grid(grid)
+    results = [None] * len(queries)
+    scratch = Scratch(grid.size) if scratch is None else scratch
+
+    for start, numbers in group_by_start(queries).items():
+        ends = list(dict.fromkeys(tuple(queries[number][1]) for number in numbers))
+        if moves.within_components():
+            ends = [end for end in ends if connected(grid, start, end)]
+        if not ends:
+            continue
+
+        if algorithm == FIELD:
+            field = distance_field(grid, start)
+            answers = {end: field.metrics(end) for end in ends}
+            for metrics in answers.values():
+                if metrics is not None:
+                    metrics["time"] += field.time
+        elif algorithm in GROUPED and len(ends) > 1:
+            if algorithm == "dijkstra":
+                found = cheapest_paths(grid, start, ends, HEADLESS, moves, 0, len(ends), scratch)
+            else:
+                found = bfs_paths(grid, start, ends, HEADLESS, len(ends))
+            answers = {
+                end: make_metrics(path, seconds, start, end, expanded_nodes, GROUPED[algorithm], cost)
+                for end, cost, path, seconds, expanded_nodes in found
+            }
+        elif algorithm in LABELS:
+            scale = grid.min_cost() if algorithm == "a_star" else 0
+            answers = {
+                end: cheapest_path(grid, start, end, HEADLESS, moves, scale, LABELS[algorithm], scratch)
+                for end in ends
+            }
+        else:
+            method = getattr(Strategy, algorithm)
+            answers = {end: method(None, grid, start, end) for end in ends}
+
+        for number in numbers:
+            metrics = answers.get(tuple(queries[number][1]))
+            results[number] = copy_metrics(metrics)
+    return results
@@ -0,0 +1,316 @@
+# benchmark.py
+
+import argparse
+import gc
+import hashlib
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+from algorithms import Strategy, ALGORITHMS
+from probes import instrument
+from scenarios import make_map
+
+# Bumped whenever the scenario generators change, so old baselines are not compared against new maps
+CORPUS_VERSION = 2
+
+# (family, rows, density) of every scenario group; each group holds SEEDS maps
+CORPUS = [
+    ("open", 128, 0.0),
+    ("open", 512, 0.0),
+    ("random", 128, 0.2),
+    ("random", 128, 0.35),
+    ("random", 512, 0.2),
+    ("random", 512, 0.35),
+    ("maze", 127, 0.0),
+    ("maze", 255, 0.0),
+    ("rooms", 128, 0.1),
+    ("rooms", 512, 0.1),
+    ("noise", 128, 0.35),
+    ("noise", 512, 0.35),
+]
+QUICK_CORPUS = [
+    ("open", 64, 0.0),
+    ("random", 64, 0.3),
+    ("maze", 63, 0.0),
+    ("rooms", 64, 0.1),
+    ("noise", 64, 0.3),
+]
+SEEDS = 3
+WARMUPS = 1
+REPEATS = 5
+THRESHOLD = 0.10  # Slowdown of the median, as a fraction, that counts as a regression
+
+
+def group_name(family, rows, density):
+    """
+    Names a scenario group.
+
+    Args:
+        family (str): Map family.
+        rows (int): Number of rows (and columns).
+        density (float): Obstacle density.
+
+    Returns:
+        str: e.g. "random-512-0.35".
+    """
+    return f"{family}-{rows}-{density:g}"
+
+
+def build_corpus(corpus=CORPUS, seeds=SEEDS, seed=0):
+    """
+    Generates the maps of every scenario group.
+
+    Args:
+        corpus (list): (family, rows, density) of every group.
+        seeds (int): Number of maps per group.
+        seed (int): Seed of the whole corpus; the same seed reproduces the same maps.
+
+    Returns:
+        dict: Maps each group name to a list of (layout, start, end), with frozen layouts.
+    """
+    groups = {}
+    for family, rows, density in corpus:
+        name = group_name(family, rows, density)
+        groups[name] = []
+        for number in range(seeds):
+            layout, start, end = make_map(family, rows, density, f"{seed}:{name}:{number}")
+            groups[name].append((layout.freeze(), start, end))
+    return groups
+
+
+def corpus_digest(scenarios):
+    """
+    Hashes the maps and endpoints of a scenario group.
+
+    Args:
+        scenarios (list): (layout, start, end) of the group.
+
+    Returns:
+        str: Hex digest, equal only for identical scenarios.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for layout, start, end in scenarios:
+        digest.update(f"{layout.fingerprint()}{start}{end}".encode())
+    return digest.hexdigest()
+
+
+def time_call(function, warmups=WARMUPS, repeats=REPEATS):
+    """
+    Times a call with time.perf_counter_ns, after warmup calls, with the garbage collector off like timeit.
+
+    Args:
+        function (function): The call to time, without arguments.
+        warmups (int): Untimed calls made first, to fill caches.
+        repeats (int): Timed calls.
+
+    Returns:
+        tuple: (samples, result) where samples lists the nanoseconds of every timed call
+        and result is what the last call returned.
+    """
+    result = None
+    for _ in range(warmups):
+        result = function()
+    samples = []
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            begin = time.perf_counter_ns()
+            result = function()
+            samples.append(time.perf_counter_ns() - begin)
+    finally:
+        if enabled:
+            gc.enable()
+    return samples, result
+
+
+def percentile(samples, fraction):
+    """
+    Nearest-rank percentile.
+
+    Args:
+        samples (list): The measured values.
+        fraction (float): e.g. 0.95 for the 95th percentile.
+
+    Returns:
+        float: The smallest sample with at least that fraction of the samples at or below it.
+    """
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def run_benchmark(algorithms=ALGORITHMS, corpus=CORPUS, seeds=SEEDS, warmups=WARMUPS, repeats=REPEATS, seed=0,
+                  stats=False):
+    """
+    Times every Strategy method headless on every scenario of the corpus.
+
+    The median, 95th percentile and minimum of the repeats are taken per map
+    and averaged over the maps of a group, so a group's figures are those of
+    one typical query rather than a mix of easy and hard maps. Timings are
+    warm: the warmup calls build the per-grid caches, such as the component
+    index, that any long-running caller would keep. Expanded nodes
+    and path costs do not depend on the machine, so a change in them means the
+    search itself behaves differently, not that it runs at another speed.
+
+    Args:
+        algorithms (list): Names of the Strategy methods to time.
+        corpus (list): (family, rows, density) of every scenario group.
+        seeds (int): Number of maps per group.
+        warmups (int): Untimed calls per scenario and algorithm.
+        repeats (int): Timed calls per scenario and algorithm.
+        seed (int): Seed of the whole corpus.
+        stats (bool): Also run every scenario once more under probes.instrument(), untimed,
+            and add up its counters as "stats" in the group's results.
+
+    Returns:
+        dict: The report, ready for json.dump(): "meta", "config", "corpus" (digest of every
+        group) and "results", mapping algorithm -> group -> median_ms, p95_ms, min_ms,
+        samples, found, expanded_nodes and cost.
+    """
+    groups = build_corpus(corpus, seeds, seed)
+    results = {}
+    for algo_name in algorithms:
+        method = getattr(Strategy, algo_name)
+        results[algo_name] = {}
+        for name, scenarios in groups.items():
+            medians, tails, fastest = [], [], []
+            found = expanded_nodes = cost = 0
+            for layout, start, end in scenarios:
+                samples, metrics = time_call(lambda: method(None, layout, start, end), warmups, repeats)
+                medians.append(statistics.median(samples))
+                tails.append(percentile(samples, 0.95))
+                fastest.append(min(samples))
+                if metrics:
+                    found += 1
+                    expanded_nodes += metrics["expanded_nodes"]
+                    cost += metrics["cost"]
+            if stats:
+                with instrument() as probe:
+                    for layout, start, end in scenarios:
+                        method(None, layout, start, end)
+            results[algo_name][name] = {
+                "median_ms": statistics.fmean(medians) / 1e6,
+                "p95_ms": statistics.fmean(tails) / 1e6,
+                "min_ms": statistics.fmean(fastest) / 1e6,
+                "samples": len(scenarios) * repeats,
+                "found": found,
+                "expanded_nodes": expanded_nodes,
+                "cost": round(cost, 6),
+            }
+            if stats:
+                results[algo_name][name]["stats"] = probe.totals()
+            print(f"{algo_name:>20} {name:>18} median {results[algo_name][name]['median_ms']:10.3f} ms"
+                  f"  p95 {results[algo_name][name]['p95_ms']:10.3f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "numpy": np.__version__,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "config": {
+            "corpus_version": CORPUS_VERSION,
+            "seed": seed,
+            "seeds": seeds,
+            "warmups": warmups,
+            "repeats": repeats,
+        },
+        "corpus": {name: corpus_digest(scenarios) for name, scenarios in groups.items()},
+        "results": results,
+    }
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """
+    Compares a benchmark report against a baseline report.
+
+    Args:
+        baseline (dict): The report to compare against.
+        current (dict): The new report.
+        threshold (float): Relative change of the median that counts as slower or faster.
+
+    Returns:
+        list: One dictionary per (algorithm, group) of either report, with "algorithm",
+        "group", "baseline_ms", "current_ms", "ratio" and "status": "slower", "faster"
+        or "same"; "changed" when the maps or the search's expanded nodes or path cost
+        differ, so the timings are not comparable; "new" or "missing" when only one
+        report has it.
+    """
+    rows = []
+    algorithms = list(dict.fromkeys(list(current["results"]) + list(baseline["results"])))
+    for algo_name in algorithms:
+        old_groups = baseline["results"].get(algo_name, {})
+        new_groups = current["results"].get(algo_name, {})
+        for name in dict.fromkeys(list(new_groups) + list(old_groups)):
+            old, new = old_groups.get(name), new_groups.get(name)
+            row = {"algorithm": algo_name, "group": name, "baseline_ms": None, "current_ms": None, "ratio": None}
+            if old is None or new is None:
+                row["status"] = "new" if old is None else "missing"
+                row["baseline_ms" if new is None else "current_ms"] = (old or new)["median_ms"]
+                rows.append(row)
+                continue
+            row.update(baseline_ms=old["median_ms"], current_ms=new["median_ms"])
+            row["ratio"] = new["median_ms"] / old["median_ms"] if old["median_ms"] else None
+            same_maps = (baseline["config"].get("corpus_version") == current["config"].get("corpus_version")
+                         and baseline["corpus"].get(name) == current["corpus"].get(name))
+            same_search = all(old[key] == new[key] for key in ("found", "expanded_nodes", "cost"))
+            if not same_maps or not same_search:
+                row["status"] = "changed"
+            elif row["ratio"] is not None and row["ratio"] > 1 + threshold:
+                row["status"] = "slower"
+            elif row["ratio"] is not None and row["ratio"] < 1 - threshold:
+                row["status"] = "faster"
+            else:
+                row["status"] = "same"
+            rows.append(row)
+    return rows
+
+
+def print_comparison(rows):
+    """
+    Prints the output of compare() as a table.
+
+    Args:
+        rows (list): The dictionaries returned by compare().
+    """
+    print(f"{'algorithm':>20} {'group':>18} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}  status")
+    for row in rows:
+        baseline = "-" if row["baseline_ms"] is None else f"{row['baseline_ms']:.3f}"
+        current = "-" if row["current_ms"] is None else f"{row['current_ms']:.3f}"
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.2f}"
+        print(f"{row['algorithm']:>20} {row['group']:>18} {baseline:>12} {current:>12} {ratio:>7}  {row['status']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times the Strategy searches on a seeded scenario corpus.")
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument("--quick", action="store_true", help="small maps only, for a fast check")
+    parser.add_argument("--seeds", type=int, default=SEEDS, help="maps per scenario group")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the whole corpus")
+    parser.add_argument("--warmups", type=int, default=WARMUPS)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--output", help="write the report to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON report")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="median slowdown that fails, e.g. 0.1")
+    parser.add_argument("--stats", action="store_true", help="add heap, neighbor and phase counters to the report")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.algorithms, QUICK_CORPUS if args.quick else CORPUS,
+                           args.seeds, args.warmups, args.repeats, args.seed, args.stats)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Report saved to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as file:
+            comparison = compare(json.load(file), report, args.threshold)
+        print_comparison(comparison)
+        if any(row["status"] == "slower" for row in comparison):
+            sys.exit(1)
@@ -0,0 +1,186 @@
+# cache.py
+
+import time
+from collections import OrderedDict
+from algorithms import Strategy
+from grid import as_grid
+from search import make_metrics
+
+# Strategy methods that always return a shortest path, so any stretch of one is a shortest path too
+SHORTEST_PATHS = {
+    "a_star", "dijkstra", "bfs", "jps", "bidirectional_bfs", "bidirectional_a_star", "lpa_star",
+}
+
+
+def copy_metrics(metrics):
+    """
+    Copies a metrics dictionary along with its path list.
+
+    Args:
+        metrics (dict): The metrics dictionary, or None.
+
+    Returns:
+        dict: The copy, or None.
+    """
+    return None if metrics is None else dict(metrics, path=list(metrics["path"]))
+
+
+class PathCache:
+    """
+    A bounded LRU cache of headless Strategy results.
+
+    Results are keyed by the grid's fingerprint, the endpoints, the algorithm
+    and any extra options, so a repeated query on an unchanged layout returns
+    the stored metrics without searching or reading the grid again, and any
+    edit to the grid changes the fingerprint and misses.
+
+    Paths are copied into and out of the cache, so callers may change the
+    metrics and paths they get back.
+
+    For algorithms that return shortest paths, a query whose endpoints both lie
+    in order on a cached path of the same layout is answered from that stretch
+    of it: every stretch of a shortest path is itself a shortest path.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results.
+        hits (int): Queries answered from a cached result.
+        subpath_hits (int): Queries answered from a stretch of a cached path.
+        misses (int): Queries that ran a search.
+    """
+
+    def __init__(self, maxsize=1024):
+        """
+        Initializes an empty PathCache.
+
+        Args:
+            maxsize (int): Maximum number of cached results.
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()  # Key -> metrics, least recently used first
+        self.positions = {}  # (fingerprint, algorithm, options) -> {cell: (key, index on the path)}
+
+    def run(self, algorithm, grid, start, end, **options):
+        """
+        Runs a Strategy method headless, or returns its cached result.
+
+        Args:
+            algorithm (str): Name of the Strategy method, e.g. "a_star".
+            grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+            start (tuple | list): Starting (row, col) position.
+            end (tuple | list): Goal (row, col) position.
+            **options: Extra keyword arguments for the Strategy method, such as moves.
+
+        Returns:
+            dict: A copy of the metrics dictionary, or None if no path is found.
+        """
+        grid = as_grid(grid)
+        start, end = tuple(start), tuple(end)
+        fingerprint = grid.fingerprint()
+        variant = (fingerprint, algorithm, tuple(sorted(options.items())))
+        key = variant + (start, end)
+
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return copy_metrics(self.entries[key])
+
+        if algorithm in SHORTEST_PATHS:
+            metrics = self.from_subpath(variant, grid, start, end)
+            if metrics is not None:
+                self.subpath_hits += 1
+                return metrics
+
+        self.misses += 1
+        metrics = getattr(Strategy, algorithm)(None, grid, start, end, **options)
+        self.store(variant, key, copy_metrics(metrics))
+        return metrics
+
+    def from_subpath(self, variant, grid, start, end):
+        """
+        Builds metrics for a query from a cached path that passes through both endpoints.
+
+        Args:
+            variant (tuple): (fingerprint, algorithm, options) of the query.
+            grid (Grid): The grid, only read for the cost of a weighted stretch.
+            start (tuple): Starting (row, col) position.
+            end (tuple): Goal (row, col) position.
+
+        Returns:
+            dict: The metrics of the stretch, or None if no cached path covers it.
+        """
+        positions = self.positions.get(variant)
+        if not positions or start not in positions or end not in positions:
+            return None
+        start_time = time.perf_counter()
+        key, first = positions[start]
+        other_key, last = positions[end]
+        if key != other_key or first > last:
+            return None
+        cached = self.entries[key]
+        path = cached["path"][first:last + 1]
+        moves = dict(variant[2]).get("moves")
+        cost = moves.path_cost(grid, path) if moves else grid.path_cost(path)
+        total_time = time.perf_counter() - start_time
+        return make_metrics(path, total_time, start, end, 0, cached["algorithm"], cost)
+
+    def store(self, variant, key, metrics):
+        """
+        Adds a result, evicting the least recently used one when the cache is full.
+
+        Args:
+            variant (tuple): (fingerprint, algorithm, options) of the query.
+            key (tuple): The full cache key.
+            metrics (dict): The metrics dictionary, or None if no path was found.
+        """
+        self.entries[key] = metrics
+        if metrics is not None and variant[1] in SHORTEST_PATHS:
+            positions = self.positions.setdefault(variant, {})
+            for index, pos in enumerate(metrics["path"]):
+                positions[pos] = (key, index)
+        while len(self.entries) > self.maxsize:
+            old_key, old = self.entries.popitem(last=False)
+            self.forget_path(old_key, old)
+
+    def forget_path(self, key, metrics):
+        """
+        Removes an evicted path from the sub-path index.
+
+        Args:
+            key (tuple): The cache key of the evicted result.
+            metrics (dict): Its metrics dictionary, or None.
+        """
+        variant = key[:3]
+        positions = self.positions.get(variant)
+        if metrics is None or positions is None:
+            return
+        for pos in metrics["path"]:
+            if positions.get(pos, (None,))[0] == key:
+                del positions[pos]
+        if not positions:
+            del self.positions[variant]
+
+    def info(self):
+        """
+        Summarizes the cache usage.
+
+        Returns:
+            dict: hits, subpath_hits, misses, size and maxsize.
+        """
+        return {
+            "hits": self.hits,
+            "subpath_hits": self.subpath_hits,
+            "misses": self.misses,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        """
+        Drops every cached result and resets the counters.
+        """
+        self.entries.clear()
+        self.positions.clear()
+        self.hits = self.subpath_hits = self.misses = 0
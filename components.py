@@ -0,0 +1,283 @@
+# components.py
+
+from collections import deque
+import numpy as np
+from grid import FREE
+
+# Label of blocked cells
+NO_COMPONENT = -1
+
+# The 8 cells around a cell in ring order, starting above and going clockwise
+RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+def label_components(grid):
+    """
+    Labels the 4-connected regions of free cells in a few vectorized passes.
+
+    Each row is cut into runs of consecutive free cells, runs that touch
+    vertically are joined with a hook-and-compress union-find over numpy
+    arrays, and the surviving roots are renumbered from zero.
+
+    Args:
+        grid (Grid): The grid to label.
+
+    Returns:
+        tuple: (labels, count) where labels is a flat int32 array holding each free cell's
+        component and NO_COMPONENT for barriers, and count is the number of components.
+    """
+    free = grid.cells == FREE
+    left = np.zeros_like(free)
+    left[:, 1:] = free[:, :-1]
+    run_ids = (np.cumsum((free & ~left).ravel()) - 1).reshape(free.shape)
+    runs = int(run_ids[-1, -1]) + 1 if free.any() else 0
+
+    # One edge per stretch where two runs overlap vertically: its first column
+    touching = free[:-1] & free[1:]
+    first = touching.copy()
+    first[:, 1:] &= ~touching[:, :-1]
+    upper, lower = run_ids[:-1][first], run_ids[1:][first]
+
+    roots = np.arange(runs)
+    while upper.size:
+        upper_roots, lower_roots = roots[upper], roots[lower]
+        open_edges = upper_roots != lower_roots
+        if not open_edges.any():
+            break
+        upper, lower = upper[open_edges], lower[open_edges]
+        upper_roots, lower_roots = upper_roots[open_edges], lower_roots[open_edges]
+        # Hook the larger root of every edge under the smaller one, then flatten
+        np.minimum.at(roots, np.maximum(upper_roots, lower_roots), np.minimum(upper_roots, lower_roots))
+        while True:
+            flattened = roots[roots]
+            if np.array_equal(flattened, roots):
+                break
+            roots = flattened
+
+    components, run_labels = np.unique(roots, return_inverse=True)
+    labels = np.full(grid.size, NO_COMPONENT, dtype=np.int32)
+    flat_free = free.ravel()
+    labels[flat_free] = run_labels[run_ids.ravel()[flat_free]]
+    return labels, len(components)
+
+
+class ComponentIndex:
+    """
+    Answers "is there any path between these cells" in O(1).
+
+    Built once per grid through Grid.derived, and kept up to date cell by cell
+    when barriers are added or removed with Grid.set_barrier. Freeing a cell
+    merges the components around it through a small union-find over labels;
+    blocking a cell only floods when the cells around it might have been split.
+
+    Attributes:
+        grid (Grid): The indexed grid.
+        labels (numpy.ndarray): Flat int32 component label of each cell, NO_COMPONENT for barriers.
+        parents (list): Union-find parent of each label; a root labels a whole component.
+    """
+
+    def __init__(self, grid):
+        """
+        Initializes a ComponentIndex.
+
+        Args:
+            grid (Grid): The grid to index.
+        """
+        self.grid = grid
+        self.labels, count = label_components(grid)
+        self.parents = list(range(count))
+
+    def find(self, label):
+        """
+        Gets the root of a label, compressing the path to it.
+
+        Args:
+            label (int): A component label.
+
+        Returns:
+            int: The root label of the component.
+        """
+        parents = self.parents
+        root = label
+        while parents[root] != root:
+            root = parents[root]
+        while parents[label] != root:
+            parents[label], label = root, parents[label]
+        return root
+
+    def component(self, pos):
+        """
+        Gets the component of a cell.
+
+        Args:
+            pos (tuple): The (row, col) position.
+
+        Returns:
+            int: The root label of the cell's component, or NO_COMPONENT for a barrier.
+        """
+        label = int(self.labels[self.grid.index(pos)])
+        return label if label == NO_COMPONENT else self.find(label)
+
+    def connected(self, start, end):
+        """
+        Checks if two cells are in the same component.
+
+        Args:
+            start (tuple): The first (row, col) position.
+            end (tuple): The second (row, col) position.
+
+        Returns:
+            bool: True if a path exists between the two cells.
+        """
+        label = self.component(start)
+        return label != NO_COMPONENT and label == self.component(end)
+
+    def update(self, pos):
+        """
+        Updates the index after the cell at pos changed between free and barrier.
+
+        Args:
+            pos (tuple): The (row, col) position that was edited.
+
+        Returns:
+            bool: Always True, so Grid keeps the index instead of rebuilding it.
+        """
+        grid = self.grid
+        index = grid.index(pos)
+        around = grid.neighbors(index)
+
+        if not grid.is_barrier(pos):
+            roots = {self.find(int(self.labels[n])) for n in around}
+            if roots:
+                label = min(roots)
+                for root in roots:
+                    self.parents[root] = label
+            else:
+                label = len(self.parents)
+                self.parents.append(label)
+            self.labels[index] = label
+            return True
+
+        self.labels[index] = NO_COMPONENT
+        if len(around) > 1 and not self.joined_around(pos):
+            self.split(around)
+        return True
+
+    def joined_around(self, pos):
+        """
+        Checks if the free neighbors of a cell stay connected through the 8 cells around it.
+
+        Args:
+            pos (tuple): The (row, col) position of the new barrier.
+
+        Returns:
+            bool: True if every free 4-neighbor lies on one unbroken free arc of the ring.
+        """
+        grid = self.grid
+        row, col = pos
+        ring = []
+        for dr, dc in RING:
+            cell = (row + dr, col + dc)
+            ring.append(grid.in_bounds(cell) and not grid.is_barrier(cell))
+        if all(ring):
+            return True
+
+        # Walk the ring from a blocked cell and count the free arcs holding a 4-neighbor
+        first = ring.index(False)
+        arcs = 0
+        has_neighbor = False
+        for offset in range(1, 9):
+            slot = (first + offset) % 8
+            if ring[slot]:
+                has_neighbor = has_neighbor or slot % 2 == 0
+            else:
+                arcs += has_neighbor
+                has_neighbor = False
+        return arcs <= 1
+
+    def split(self, seeds):
+        """
+        Floods out from the cells around a new barrier to find pieces that were cut off.
+
+        The floods advance one cell at a time in turn and merge when they touch,
+        so the work is bounded by the size of the pieces that get a new label
+        rather than by the size of the component that keeps the old one.
+
+        Args:
+            seeds (list): Flat indices of the free neighbors of the new barrier.
+        """
+        grid = self.grid
+        owners = {seed: group for group, seed in enumerate(seeds)}
+        groups = list(range(len(seeds)))
+        queues = [deque([seed]) for seed in seeds]
+        cells = [[seed] for seed in seeds]
+
+        def find_group(group):
+            while groups[group] != group:
+                groups[group] = groups[groups[group]]
+                group = groups[group]
+            return group
+
+        active = set(range(len(seeds)))
+        while len(active) > 1:
+            for group in list(active):
+                if group not in active:
+                    continue
+                queue = queues[group]
+                if not queue:
+                    # Cut off from every other flood: this piece becomes its own component
+                    active.discard(group)
+                    label = len(self.parents)
+                    self.parents.append(label)
+                    self.labels[cells[group]] = label
+                    if len(active) == 1:
+                        return
+                    continue
+
+                current = queue.popleft()
+                for neighbor in grid.neighbors(current):
+                    owner = owners.get(neighbor)
+                    if owner is None:
+                        owners[neighbor] = group
+                        queues[group].append(neighbor)
+                        cells[group].append(neighbor)
+                        continue
+                    owner = find_group(owner)
+                    if owner != group:
+                        # The floods met: merge the smaller one into the larger
+                        keep, drop = (group, owner) if len(cells[group]) >= len(cells[owner]) else (owner, group)
+                        groups[drop] = keep
+                        queues[keep].extend(queues[drop])
+                        cells[keep].extend(cells[drop])
+                        active.discard(drop)
+                        group = keep
+                if len(active) == 1:
+                    return
+
+
+def components(grid):
+    """
+    Gets the ComponentIndex of a grid, building it on first use.
+
+    Args:
+        grid (Grid): The grid.
+
+    Returns:
+        ComponentIndex: The cached index.
+    """
+    return grid.derived("components", ComponentIndex)
+
+
+def connected(grid, start, end):
+    """
+    Checks in O(1) if a path exists between two cells of a grid.
+
+    Args:
+        grid (Grid): The grid.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+
+    Returns:
+        bool: True if a path exists.
+    """
+    return components(grid).connected(start, end)
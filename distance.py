@@ -0,0 +1,158 @@
+# distance.py
+
+import time
+import numpy as np
+from grid import as_grid, FREE
+from search import make_metrics
+
+UNREACHED = -1
+
+
+class DistanceField:
+    """
+    Shortest 4-connected distances from one source cell to every cell of a grid.
+
+    Attributes:
+        grid (Grid): The grid that was swept.
+        source (tuple): The (row, col) position the field was computed from.
+        dist (numpy.ndarray): (rows, cols) int32 distances, UNREACHED where no path exists.
+        parents (numpy.ndarray): Flat int32 array mapping each reached cell to its predecessor.
+        time (float): Time taken by the sweep in seconds.
+    """
+
+    def __init__(self, grid, source, dist, parents, total_time):
+        """
+        Initializes a DistanceField. Use distance_field() to compute one.
+
+        Args:
+            grid (Grid): The grid that was swept.
+            source (tuple): The (row, col) source position.
+            dist (numpy.ndarray): (rows, cols) int32 distances.
+            parents (numpy.ndarray): Flat int32 predecessor indices.
+            total_time (float): Time taken by the sweep in seconds.
+        """
+        self.grid = grid
+        self.source = source
+        self.dist = dist
+        self.parents = parents
+        self.time = total_time
+
+    def distance(self, pos):
+        """
+        Gets the shortest distance to a position.
+
+        Args:
+            pos (tuple): The (row, col) position.
+
+        Returns:
+            int: Number of moves from the source, or UNREACHED.
+        """
+        return int(self.dist[pos[0], pos[1]])
+
+    def reached(self):
+        """
+        Counts the cells reachable from the source, including the source itself.
+
+        Returns:
+            int: Number of reached cells.
+        """
+        return int(np.count_nonzero(self.dist != UNREACHED))
+
+    def path(self, pos):
+        """
+        Extracts the shortest path to a position in O(path length).
+
+        Args:
+            pos (tuple): The (row, col) goal position.
+
+        Returns:
+            list: The path as a list of (row, col) positions, source first, or None if unreachable.
+        """
+        if self.distance(pos) == UNREACHED:
+            return None
+        grid = self.grid
+        parents = self.parents
+        source = grid.index(self.source)
+        current = grid.index(pos)
+        path = []
+        while current != source:
+            path.append(grid.pos(current))
+            current = int(parents[current])
+        path.append(self.source)
+        path.reverse()
+        return path
+
+    def metrics(self, end):
+        """
+        Builds the usual metrics dictionary for one goal.
+
+        Every reached cell counts as expanded, and the time is only the cost of
+        extracting this path; the shared sweep cost is in the time attribute.
+
+        Args:
+            end (tuple): The (row, col) goal position.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        start_time = time.perf_counter()
+        path = self.path(end)
+        if path is None:
+            return None
+        total_time = time.perf_counter() - start_time
+        return make_metrics(path, total_time, self.source, end, self.reached(), "BFS_field", self.grid.path_cost(path))
+
+
+def distance_field(grid, source):
+    """
+    Computes a DistanceField with a frontier-at-a-time BFS.
+
+    Each level shifts the whole wavefront one cell in every direction at once,
+    masks out walls, barriers and cells that were already reached, and records
+    the new cells' distances and parents with array writes. Directions are
+    applied in Spot.update_neighbors order, so a cell reached from several
+    frontier cells takes its parent from the first direction that hits it.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        source (tuple): The (row, col) source position.
+
+    Returns:
+        DistanceField: The distances and parents from the source.
+    """
+    grid = as_grid(grid)
+    start_time = time.perf_counter()
+    cols = grid.cols
+    size = grid.size
+    free = grid.cells.ravel() == FREE
+    dist = np.full(size, UNREACHED, dtype=np.int32)
+    parents = np.full(size, UNREACHED, dtype=np.int32)
+
+    origin = grid.index(source)
+    dist[origin] = 0
+    parents[origin] = origin
+    frontier = np.array([origin], dtype=np.intp)
+    level = 0
+
+    while frontier.size:
+        level += 1
+        frontier_cols = frontier % cols
+        shifts = (
+            (cols, frontier < size - cols),  # Below
+            (-cols, frontier >= cols),  # Above
+            (1, frontier_cols < cols - 1),  # Right
+            (-1, frontier_cols > 0),  # Left
+        )
+        reached = []
+        for step, inside in shifts:
+            origins = frontier[inside]
+            targets = origins + step
+            new = free[targets] & (dist[targets] == UNREACHED)
+            targets = targets[new]
+            dist[targets] = level
+            parents[targets] = origins[new]
+            reached.append(targets)
+        frontier = np.concatenate(reached)
+
+    total_time = time.perf_counter() - start_time
+    return DistanceField(grid, source, dist.reshape(grid.rows, cols), parents, total_time)
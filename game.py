@@ -1,9 +1,131 @@
+import time
+import numpy as np
 import pygame
+from grid import Grid
 from spot import Spot
 
 # Define colors
 WHITE = (255, 255, 255)
 GREY = (128, 128, 128)
+BLACK = (0, 0, 0)
+
+# Colors indexed by Grid cell value (FREE, BARRIER)
+CELL_COLORS = np.array([WHITE, BLACK], dtype=np.uint8)
+
+# Default cap on how often a search animation refreshes the window
+FPS = 60
+
+
+class SpotGrid(list):
+    """
+    A 2D list of Spot objects that remembers which Spots changed color since the last frame.
+
+    Attributes:
+        changed (set): Spots recolored since they were last drawn, filled in by the Spots themselves.
+        renderer (Renderer): The renderer drawing this grid, created by Game.draw.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty SpotGrid.
+        """
+        super().__init__()
+        self.changed = set()
+        self.renderer = None
+
+
+class Renderer:
+    """
+    Draws a SpotGrid to a window, redrawing only what changed.
+
+    The first frame draws every Spot; later frames only redraw the Spots in
+    grid.changed and update just their rectangles on screen. Grid lines are
+    rendered once to a transparent overlay that is blitted back over each
+    redrawn Spot. Frames are also rate limited, either to fps frames per
+    second or to one frame every `every` draw calls; skipped calls keep their
+    changes for the next frame.
+
+    Attributes:
+        win (pygame.Surface): The pygame window surface.
+        grid (SpotGrid): The grid being drawn.
+        rows (int): The number of rows (and columns) in the grid.
+        width (int): The width of the grid in pixels.
+        fps (int): Maximum frames per second, or None for no time limit.
+        every (int): Draw only every N-th call instead of limiting by time, or None.
+    """
+
+    def __init__(self, win, grid, rows, width, fps=FPS, every=None):
+        """
+        Initializes a Renderer.
+
+        Args:
+            win (pygame.Surface): The pygame window surface.
+            grid (SpotGrid): The grid to draw.
+            rows (int): The number of rows (and columns) in the grid.
+            width (int): The width of the grid in pixels.
+            fps (int): Maximum frames per second, or None for no time limit.
+            every (int): Draw only every N-th call instead of limiting by time, or None.
+        """
+        self.win = win
+        self.grid = grid
+        self.rows = rows
+        self.width = width
+        self.fps = fps
+        self.every = every
+        self.lines = Game.make_lines(rows, width)
+        self.full = True  # Nothing is on screen yet
+        self.last_frame = 0.0
+        self.calls = 0
+
+    def due(self):
+        """
+        Checks whether this draw call should produce a frame.
+
+        Returns:
+            bool: True if the frame limit allows a frame now.
+        """
+        if self.every:
+            self.calls += 1
+            if self.calls < self.every:
+                return False
+            self.calls = 0
+            return True
+        if self.fps:
+            now = time.perf_counter()
+            if now - self.last_frame < 1 / self.fps:
+                return False
+            self.last_frame = now
+        return True
+
+    def draw(self, force=False):
+        """
+        Draws a frame if one is due.
+
+        Args:
+            force (bool): Draw even if the frame limit would skip this call.
+        """
+        if not (force or self.full or self.due()):
+            return
+
+        changed = self.grid.changed
+        if self.full:
+            self.win.fill(WHITE)
+            for row in self.grid:
+                for spot in row:
+                    spot.draw(self.win)
+            self.win.blit(self.lines, (0, 0))
+            pygame.display.update()
+            self.full = False
+        elif changed:
+            rects = []
+            for spot in changed:
+                spot.draw(self.win)
+                # Grid lines sit on the cell edges, so cover the lines on the far side too
+                rect = pygame.Rect(spot.x, spot.y, spot.width + 1, spot.width + 1)
+                self.win.blit(self.lines, rect, rect)
+                rects.append(rect)
+            pygame.display.update(rects)
+        changed.clear()
 
 
 class Game:
@@ -12,26 +134,43 @@ class Game:
     """
 
     @staticmethod
-    def make_grid(rows, width):
+    def make_grid(rows, width, layout=None):
         """
         Creates a grid of Spot objects.
 
         Args:
             rows (int): The number of rows (and columns) in the grid.
             width (int): The width of the grid in pixels.
+            layout (Grid): Optional occupancy grid whose barriers are copied onto the Spots.
 
         Returns:
-            list: A 2D list of Spot objects representing the grid.
+            SpotGrid: A 2D list of Spot objects representing the grid.
         """
-        grid = []
+        grid = SpotGrid()
         gap = width // rows  # Width of each cell in the grid
         for i in range(rows):
             grid.append([])
             for j in range(rows):
-                spot = Spot(i, j, gap, rows)
+                spot = Spot(i, j, gap, rows, grid.changed)
                 grid[i].append(spot)
+        if layout is not None:
+            for i, j in np.argwhere(layout.cells):
+                grid[i][j].make_barrier()
         return grid
 
+    @staticmethod
+    def clear_search(grid):
+        """
+        Resets the Spots a previous search colored (open, closed and path) so the grid can be searched again.
+
+        Args:
+            grid (list): The 2D list of Spot objects representing the grid.
+        """
+        for row in grid:
+            for spot in row:
+                if spot.is_open() or spot.is_closed() or spot.is_path():
+                    spot.reset()
+
     @staticmethod
     def draw_grid(win, rows, width):
         """
@@ -44,23 +183,55 @@ class Game:
         """
         gap = width // rows
         for i in range(rows):
-            # Horizontal lines
-            pygame.draw.line(win, GREY, (0, i * gap), (width, i * gap))
-            for j in range(rows):
-                # Vertical lines
-                pygame.draw.line(win, GREY, (j * gap, 0), (j * gap, width))
+            pygame.draw.line(win, GREY, (0, i * gap), (width, i * gap))  # Horizontal line
+            pygame.draw.line(win, GREY, (i * gap, 0), (i * gap, width))  # Vertical line
 
     @staticmethod
-    def draw(win, grid, rows, width):
+    def make_lines(rows, width):
         """
-        Draws the entire grid, including the spots and grid lines.
+        Renders the grid lines once onto a transparent surface.
+
+        Args:
+            rows (int): The number of rows (and columns) in the grid.
+            width (int): The width of the grid in pixels.
+
+        Returns:
+            pygame.Surface: A width x width surface holding only the grid lines.
+        """
+        lines = pygame.Surface((width, width), pygame.SRCALPHA)
+        Game.draw_grid(lines, rows, width)
+        return lines
+
+    @staticmethod
+    def draw(win, grid, rows, width, force=False, fps=FPS, every=None):
+        """
+        Draws the grid, including the spots and grid lines.
+
+        A SpotGrid from make_grid is drawn through its Renderer, which only
+        redraws the Spots that changed and limits how often the window refreshes.
 
         Args:
             win (pygame.Surface): The pygame window surface where the grid is drawn.
-            grid (list): The 2D list of Spot objects representing the grid.
+            grid (list | Grid): The 2D list of Spot objects, or an array-backed Grid.
             rows (int): The number of rows (and columns) in the grid.
             width (int): The width of the grid in pixels.
+            force (bool): Refresh the window even if the frame limit would skip this call.
+            fps (int): Maximum frames per second for a SpotGrid, or None for no time limit.
+            every (int): Refresh a SpotGrid only every N-th call instead of limiting by time.
         """
+        if isinstance(grid, Grid):
+            Game.draw_cells(win, grid, width)
+            pygame.display.update()
+            return
+
+        if isinstance(grid, SpotGrid):
+            renderer = grid.renderer
+            if renderer is None or renderer.win is not win:
+                renderer = grid.renderer = Renderer(win, grid, rows, width, fps, every)
+            renderer.fps, renderer.every = fps, every
+            renderer.draw(force)
+            return
+
         win.fill(WHITE)  # Clear the window with a white background
         for row in grid:
             for spot in row:
@@ -68,6 +239,22 @@ class Game:
         Game.draw_grid(win, rows, width)  # Draw the grid lines
         pygame.display.update()  # Update the display
 
+    @staticmethod
+    def draw_cells(win, grid, width):
+        """
+        Draws an array-backed Grid as one scaled image instead of one rect per cell.
+
+        Args:
+            win (pygame.Surface): The pygame window surface where the grid is drawn.
+            grid (Grid): The occupancy grid to draw.
+            width (int): The width of the grid in pixels.
+        """
+        # Spot.x follows the row index, which is also the first surfarray axis
+        surface = pygame.surfarray.make_surface(CELL_COLORS[grid.cells])
+        win.blit(pygame.transform.scale(surface, (width, width)), (0, 0))
+        if width // grid.rows > 2:  # Lines would cover the cells on dense grids
+            Game.draw_grid(win, grid.rows, width)
+
     @staticmethod
     def get_clicked_pos(pos, rows, width):
         """
@@ -0,0 +1,257 @@
+# generators.py
+
+import numpy as np
+from grid import Grid, BARRIER, FREE
+from components import components
+
+# Map families of generate()
+FAMILIES = ("open", "random", "maze", "rooms", "noise")
+
+# Width of a room of the "rooms" family, walls excluded
+ROOM_SIZE = 8
+
+# Cells between two random values of a noise field; larger values give larger blobs
+NOISE_SCALE = 8
+
+
+def numpy_rng(rng):
+    """
+    Derives a numpy Generator from a random.Random, so one seed drives both.
+
+    Args:
+        rng (random.Random): Source of randomness, or the random module itself.
+
+    Returns:
+        numpy.random.Generator: A generator seeded with 64 bits drawn from rng.
+    """
+    return np.random.default_rng(rng.getrandbits(64))
+
+
+def candidates(grid, keep=()):
+    """
+    Lists the free cells that an obstacle may be placed on.
+
+    Args:
+        grid (Grid): The occupancy grid.
+        keep (iterable): (row, col) positions to leave free, such as start and end.
+
+    Returns:
+        numpy.ndarray: Flat indices of the free cells not in keep, in increasing order.
+    """
+    free = np.flatnonzero(grid.cells.ravel() == FREE)
+    kept = [grid.index(pos) for pos in keep if pos is not None]
+    if kept:
+        free = free[~np.isin(free, kept)]
+    return free
+
+
+def scatter(grid, density, rng, keep=()):
+    """
+    Blocks exactly density of the cells, drawn uniformly from the free ones in one step.
+
+    The cells are a sample without replacement of the candidates, so the
+    cost does not grow with the density the way rejection sampling does.
+
+    Args:
+        grid (Grid): The occupancy grid.
+        density (float): Fraction of all cells to block (0 to 1), capped at the free cells.
+        rng (numpy.random.Generator): Source of randomness.
+        keep (iterable): (row, col) positions to leave free, such as start and end.
+    """
+    free = candidates(grid, keep)
+    count = min(int(grid.size * density), free.size)
+    np.put(grid.cells, rng.choice(free, count, replace=False), BARRIER)
+    grid.touch()
+
+
+def noise(grid, density, rng, scale=NOISE_SCALE, keep=()):
+    """
+    Blocks exactly density of the cells as smooth blobs, following a value noise field.
+
+    Random values on a coarse lattice every scale cells are interpolated with
+    a smoothstep over the whole grid, and the free cells with the highest
+    values become barriers, which gives caves rather than scattered cells.
+
+    Args:
+        grid (Grid): The occupancy grid.
+        density (float): Fraction of all cells to block (0 to 1), capped at the free cells.
+        rng (numpy.random.Generator): Source of randomness.
+        scale (int): Cells between two lattice values.
+        keep (iterable): (row, col) positions to leave free, such as start and end.
+    """
+    lattice = rng.random((grid.rows // scale + 2, grid.cols // scale + 2))
+    row_at, row_frac = np.divmod(np.arange(grid.rows) / scale, 1)
+    col_at, col_frac = np.divmod(np.arange(grid.cols) / scale, 1)
+    row_at, col_at = row_at.astype(np.intp)[:, None], col_at.astype(np.intp)
+    row_frac = (row_frac * row_frac * (3 - 2 * row_frac))[:, None]
+    col_frac = col_frac * col_frac * (3 - 2 * col_frac)
+    top = lattice[row_at, col_at] * (1 - col_frac) + lattice[row_at, col_at + 1] * col_frac
+    bottom = lattice[row_at + 1, col_at] * (1 - col_frac) + lattice[row_at + 1, col_at + 1] * col_frac
+    field = (top * (1 - row_frac) + bottom * row_frac).ravel()
+
+    free = candidates(grid, keep)
+    count = min(int(grid.size * density), free.size)
+    if count:
+        highest = np.argpartition(field[free], free.size - count)[free.size - count:]
+        np.put(grid.cells, free[highest], BARRIER)
+    grid.touch()
+
+
+def carve_maze(grid, rng):
+    """
+    Turns a grid into a perfect maze: one-cell corridors with exactly one path between any two cells.
+
+    Corridors run through the cells with an odd row and column. The walls
+    knocked down between them form a minimum spanning tree over random
+    distinct weights, built with Boruvka's algorithm: every round, each
+    component takes its lightest edge to another component, all at once, and
+    the components along those edges are merged with a hook-and-compress
+    union-find, so the rounds are whole-array operations and there are at
+    most log2 of the number of corridor cells of them.
+
+    Args:
+        grid (Grid): The occupancy grid, with at least 3 rows and columns.
+        rng (numpy.random.Generator): Source of randomness.
+    """
+    rows, cols = (grid.rows - 1) // 2, (grid.cols - 1) // 2
+    nodes = np.arange(rows * cols).reshape(rows, cols)
+    first = np.concatenate((nodes[:, :-1].ravel(), nodes[:-1, :].ravel()))
+    second = np.concatenate((nodes[:, 1:].ravel(), nodes[1:, :].ravel()))
+    # Shuffling the edges makes each edge's index its random weight
+    order = rng.permutation(first.size)
+    first, second = first[order], second[order]
+
+    roots = np.arange(rows * cols)
+    tree = np.zeros(first.size, dtype=bool)
+    while True:
+        first_roots, second_roots = roots[first], roots[second]
+        crossing = np.flatnonzero(first_roots != second_roots)
+        if not crossing.size:
+            break
+        lightest = np.full(roots.size, first.size)
+        np.minimum.at(lightest, first_roots[crossing], crossing)
+        np.minimum.at(lightest, second_roots[crossing], crossing)
+        chosen = np.unique(lightest[lightest < first.size])
+        tree[chosen] = True
+
+        upper, lower = first[chosen], second[chosen]
+        while upper.size:
+            upper_roots, lower_roots = roots[upper], roots[lower]
+            open_edges = upper_roots != lower_roots
+            if not open_edges.any():
+                break
+            upper, lower = upper[open_edges], lower[open_edges]
+            upper_roots, lower_roots = upper_roots[open_edges], lower_roots[open_edges]
+            np.minimum.at(roots, np.maximum(upper_roots, lower_roots), np.minimum(upper_roots, lower_roots))
+            while True:
+                flattened = roots[roots]
+                if np.array_equal(flattened, roots):
+                    break
+                roots = flattened
+
+    cells = grid.cells
+    cells.fill(BARRIER)
+    cells[1:2 * rows:2, 1:2 * cols:2] = FREE
+    first_rows, first_cols = np.divmod(first[tree], cols)
+    second_rows, second_cols = np.divmod(second[tree], cols)
+    cells[first_rows + second_rows + 1, first_cols + second_cols + 1] = FREE
+    grid.touch()
+
+
+def build_rooms(grid, rng, room_size=ROOM_SIZE):
+    """
+    Divides a grid into square rooms with one-cell walls and a door in every wall between two rooms.
+
+    Args:
+        grid (Grid): The occupancy grid.
+        rng (numpy.random.Generator): Source of randomness.
+        room_size (int): Width of a room, walls excluded.
+    """
+    cells = grid.cells
+    step = room_size + 1
+    cells[step - 1::step, :] = BARRIER
+    cells[:, step - 1::step] = BARRIER
+
+    walls = np.arange(step - 1, grid.rows, step)[:, None]
+    firsts = np.arange(0, grid.cols, step)
+    widths = np.minimum(firsts + room_size, grid.cols) - firsts
+    cells[walls, firsts + (rng.random((walls.size, firsts.size)) * widths).astype(np.intp)] = FREE
+
+    walls = np.arange(step - 1, grid.cols, step)
+    firsts = np.arange(0, grid.rows, step)[:, None]
+    widths = np.minimum(firsts + room_size, grid.rows) - firsts
+    cells[firsts + (rng.random((firsts.size, walls.size)) * widths).astype(np.intp), walls] = FREE
+    grid.touch()
+
+
+def reachable_pair(grid, rng):
+    """
+    Draws distinct start and end cells joined by a path, without retries.
+
+    The component labels of the grid give the size of every component, a
+    component is drawn with a weight equal to its number of ordered cell
+    pairs, and two distinct cells are drawn from it, so every reachable pair
+    is equally likely. The ComponentIndex built here stays cached on the grid.
+
+    Args:
+        grid (Grid): The occupancy grid.
+        rng (numpy.random.Generator): Source of randomness.
+
+    Returns:
+        tuple: Start and end positions as (row, col) tuples.
+
+    Raises:
+        ValueError: If no two free cells are connected.
+    """
+    index = components(grid)
+    roots = np.asarray(index.parents, dtype=np.int32)
+    while True:
+        flattened = roots[roots]
+        if np.array_equal(flattened, roots):
+            break
+        roots = flattened
+    free = np.flatnonzero(index.labels >= 0)
+    labels = roots[index.labels[free]]
+    sizes = np.bincount(labels, minlength=roots.size).astype(np.float64)
+    pairs = sizes * (sizes - 1)
+    if not free.size or not pairs.any():
+        raise ValueError("no two free cells of the grid are connected")
+    label = rng.choice(sizes.size, p=pairs / pairs.sum())
+    start, end = rng.choice(free[labels == label], 2, replace=False)
+    return grid.pos(int(start)), grid.pos(int(end))
+
+
+def generate(family, rows, density, rng, cols=None):
+    """
+    Generates a layout of one of the map FAMILIES with reachable start and end points.
+
+    "open" has no barriers, "random" scatters barriers over density of the
+    cells, "maze" is a perfect maze, "rooms" scatters as many barriers again
+    inside a grid of rooms and "noise" blocks density of the cells as blobs.
+
+    Args:
+        family (str): One of FAMILIES.
+        rows (int): Number of rows in the grid.
+        density (float): Obstacle density (0 to 1) of the "random", "rooms" and "noise" families.
+        rng (numpy.random.Generator): Source of randomness; the same state gives the same map.
+        cols (int): Number of columns, defaults to rows for a square grid.
+
+    Returns:
+        tuple: (layout, start, end) where layout is a Grid and start and end are (row, col) tuples.
+
+    Raises:
+        ValueError: If the family is unknown or the layout has no two connected free cells.
+    """
+    if family not in FAMILIES:
+        raise ValueError(f"unknown map family '{family}', use one of {FAMILIES}")
+    layout = Grid(rows, cols)
+    if family == "maze":
+        carve_maze(layout, rng)
+    elif family == "rooms":
+        build_rooms(layout, rng)
+    elif family == "noise":
+        noise(layout, density, rng)
+    if family in ("random", "rooms"):
+        scatter(layout, density, rng)
+    start, end = reachable_pair(layout, rng)
+    return layout, start, end
@@ -0,0 +1,373 @@
+# grid.py
+
+import hashlib
+import numpy as np
+
+# Cell values of the occupancy array
+FREE = 0
+BARRIER = 1
+
+# Range of per-cell traversal costs, stored one byte per cell
+MIN_COST = 1
+MAX_COST = 255
+
+
+class Grid:
+    """
+    A rectangular occupancy grid backed by a single contiguous uint8 array.
+
+    Cells are addressed either by (row, col) position or by the flat index
+    row * cols + col, which is what the search core works with.
+
+    Attributes:
+        rows (int): Number of rows in the grid.
+        cols (int): Number of columns in the grid.
+        size (int): Total number of cells.
+        cells (numpy.ndarray): (rows, cols) uint8 array, BARRIER where blocked.
+        costs (numpy.ndarray): (rows, cols) uint8 array holding the cost of entering each cell,
+            or None while every cell costs 1.
+        version (int): Incremented on every edit made through set_barrier or clear.
+        frozen (bool): True once freeze() made the grid read-only.
+    """
+
+    def __init__(self, rows, cols=None, cells=None, costs=None):
+        """
+        Initializes a Grid.
+
+        Args:
+            rows (int): Number of rows in the grid.
+            cols (int): Number of columns, defaults to rows for a square grid.
+            cells (array-like): Optional initial occupancy, truthy where blocked.
+            costs (array-like): Optional cost of entering each cell, from MIN_COST to MAX_COST.
+        """
+        if cols is None:
+            cols = rows
+        if cells is None:
+            cells = np.zeros((rows, cols), dtype=np.uint8)
+        else:
+            cells = np.ascontiguousarray(cells, dtype=np.uint8)
+            if cells.shape != (rows, cols):
+                raise ValueError(f"cells has shape {cells.shape}, expected {(rows, cols)}")
+        if costs is not None:
+            costs = np.asarray(costs)
+            if costs.shape != (rows, cols):
+                raise ValueError(f"costs has shape {costs.shape}, expected {(rows, cols)}")
+            if costs.size and (costs.min() < MIN_COST or costs.max() > MAX_COST):
+                raise ValueError(f"costs must be between {MIN_COST} and {MAX_COST}")
+            costs = np.ascontiguousarray(costs, dtype=np.uint8)
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.cells = cells
+        self.costs = costs
+        self.version = 0
+        self.frozen = False
+        self._blocked = None
+        self._step_costs = None
+        self._derived = {}
+
+    @staticmethod
+    def from_rows(rows):
+        """
+        Creates a Grid from a 2D sequence.
+
+        Args:
+            rows (list): 2D list where a truthy cell is a barrier.
+
+        Returns:
+            Grid: The new grid.
+        """
+        cells = np.array(rows, dtype=bool).astype(np.uint8)
+        return Grid(cells.shape[0], cells.shape[1], cells)
+
+    @staticmethod
+    def from_spots(spots):
+        """
+        Creates a Grid from a 2D list of Spot objects.
+
+        Args:
+            spots (list): 2D list of Spot objects.
+
+        Returns:
+            Grid: The new grid, with BARRIER wherever a Spot is a barrier.
+        """
+        return Grid.from_rows([[spot.is_barrier() for spot in row] for row in spots])
+
+    def index(self, pos):
+        """
+        Converts a (row, col) position to a flat cell index.
+
+        Args:
+            pos (tuple): The (row, col) position.
+
+        Returns:
+            int: The flat index.
+        """
+        return pos[0] * self.cols + pos[1]
+
+    def pos(self, index):
+        """
+        Converts a flat cell index to a (row, col) position.
+
+        Args:
+            index (int): The flat index.
+
+        Returns:
+            tuple: The (row, col) position.
+        """
+        return divmod(index, self.cols)
+
+    def in_bounds(self, pos):
+        """
+        Checks if a position lies on the grid.
+
+        Args:
+            pos (tuple): The (row, col) position.
+
+        Returns:
+            bool: True if the position is on the grid.
+        """
+        return 0 <= pos[0] < self.rows and 0 <= pos[1] < self.cols
+
+    def is_barrier(self, pos):
+        """
+        Checks if the cell at a position is a barrier.
+
+        Args:
+            pos (tuple): The (row, col) position.
+
+        Returns:
+            bool: True if the cell is blocked.
+        """
+        return self.cells[pos[0], pos[1]] == BARRIER
+
+    def set_barrier(self, pos, barrier=True):
+        """
+        Adds or removes a barrier.
+
+        Args:
+            pos (tuple): The (row, col) position.
+            barrier (bool): True to block the cell, False to free it.
+        """
+        value = BARRIER if barrier else FREE
+        if self.frozen:
+            raise ValueError("cannot edit a frozen grid, edit a copy() instead")
+        if self.cells[pos[0], pos[1]] == value:
+            return  # Repeated clicks on the same cell keep every cache
+        self.cells[pos[0], pos[1]] = value
+        self.touch(pos)
+
+    def set_cost(self, pos, cost):
+        """
+        Sets the cost of entering a cell.
+
+        Args:
+            pos (tuple): The (row, col) position.
+            cost (int): The traversal cost, from MIN_COST to MAX_COST.
+        """
+        if self.frozen:
+            raise ValueError("cannot edit a frozen grid, edit a copy() instead")
+        if not MIN_COST <= cost <= MAX_COST:
+            raise ValueError(f"cost must be between {MIN_COST} and {MAX_COST}, got {cost}")
+        if self.costs is None:
+            if cost == MIN_COST:
+                return
+            self.costs = np.full((self.rows, self.cols), MIN_COST, dtype=np.uint8)
+        if self.costs[pos[0], pos[1]] == cost:
+            return
+        self.costs[pos[0], pos[1]] = cost
+        self.touch(pos)
+
+    def clear(self):
+        """
+        Removes every barrier from the grid.
+        """
+        if self.frozen:
+            raise ValueError("cannot edit a frozen grid, edit a copy() instead")
+        self.cells.fill(FREE)
+        self.touch()
+
+    def freeze(self):
+        """
+        Makes the grid read-only so one layout can be shared by many searches.
+
+        Searches keep their state in their own buffers, so a frozen grid and the
+        values cached on it through derived() are reused by every run without
+        copying. Use copy() to get an editable grid back.
+
+        Returns:
+            Grid: The grid itself.
+        """
+        self.frozen = True
+        self.cells.flags.writeable = False
+        if self.costs is not None:
+            self.costs.flags.writeable = False
+        return self
+
+    def touch(self, pos=None):
+        """
+        Marks the grid as edited. Call this after writing to cells directly.
+
+        Derived values are dropped, except after a single-cell edit, where those
+        that have an update(pos) method returning True are updated in place.
+
+        Args:
+            pos (tuple): The (row, col) position if only that cell changed.
+        """
+        self.version += 1
+        self._blocked = None
+        self._step_costs = None
+        if pos is None:
+            self._derived = {}
+            return
+        self._derived = {
+            key: value for key, value in self._derived.items()
+            if hasattr(value, "update") and value.update(pos)
+        }
+
+    def blocked(self):
+        """
+        Gets a flat view of the occupancy for the search loops.
+
+        Indexing a memoryview is several times faster than indexing a numpy
+        array element by element, so the searches read occupancy through this.
+        It reads the cells in place, so a grid in shared memory or a mapped
+        file is not copied into each process that searches it.
+
+        Returns:
+            memoryview: One byte per cell in flat index order, nonzero where blocked.
+        """
+        if self._blocked is None:
+            self._blocked = memoryview(self.cells).cast("B")
+        return self._blocked
+
+    def step_costs(self):
+        """
+        Gets a flat view of the traversal costs for the search loops.
+
+        Returns:
+            memoryview: The cost of entering each cell in flat index order, or None on an
+            unweighted grid, where every step into a cell costs MIN_COST.
+        """
+        if self._step_costs is None and self.costs is not None:
+            self._step_costs = memoryview(self.costs).cast("B")
+        return self._step_costs
+
+    def min_cost(self):
+        """
+        Gets the cheapest cost of entering a free cell, which keeps scaled heuristics admissible.
+
+        Returns:
+            int: The smallest traversal cost of a free cell, MIN_COST on an unweighted grid.
+        """
+        if self.costs is None:
+            return MIN_COST
+        return self.derived("min_cost", lambda grid: int(grid.costs[grid.cells == FREE].min(initial=MAX_COST)))
+
+    def path_cost(self, path):
+        """
+        Adds up the cost of following a path.
+
+        Args:
+            path (list): The path as a list of (row, col) positions, start first.
+
+        Returns:
+            int: The sum of the costs of every cell entered after the start.
+        """
+        if self.costs is None:
+            return len(path) - 1
+        rows, cols = zip(*path[1:]) if len(path) > 1 else ((), ())
+        return int(self.costs[list(rows), list(cols)].sum(dtype=np.int64))
+
+    def fingerprint(self):
+        """
+        Gets a short hash of the barriers and costs, computed once per edit.
+
+        Two grids with the same shape, barriers and costs share a fingerprint, so
+        it can key results across grid objects and processes.
+
+        Returns:
+            str: Hex digest of the layout.
+        """
+        return self.derived("fingerprint", Grid.hash_layout)
+
+    def hash_layout(self):
+        """
+        Hashes the shape, barriers and costs of the grid. Use fingerprint() for the cached value.
+
+        Returns:
+            str: Hex digest of the layout.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.rows}x{self.cols}".encode())
+        digest.update(self.blocked())
+        if self.costs is not None:
+            digest.update(self.step_costs())
+        return digest.hexdigest()
+
+    def derived(self, key, build):
+        """
+        Gets a value computed from the occupancy, such as a lookup table, building it once per edit.
+
+        Args:
+            key (str): Name the value is cached under.
+            build (function): Called with the grid to compute the value when it is not cached.
+
+        Returns:
+            object: The cached or freshly built value.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = build(self)
+        return value
+
+    def neighbors(self, index):
+        """
+        Gets the free 4-connected neighbors of a cell.
+
+        The order (below, above, right, left) matches Spot.update_neighbors.
+
+        Args:
+            index (int): The flat index of the cell.
+
+        Returns:
+            list: Flat indices of the neighboring cells that are not barriers.
+        """
+        blocked = self.blocked()
+        cols = self.cols
+        row, col = divmod(index, cols)
+        result = []
+        if row < self.rows - 1 and not blocked[index + cols]:
+            result.append(index + cols)
+        if row > 0 and not blocked[index - cols]:
+            result.append(index - cols)
+        if col < cols - 1 and not blocked[index + 1]:
+            result.append(index + 1)
+        if col > 0 and not blocked[index - 1]:
+            result.append(index - 1)
+        return result
+
+    def copy(self):
+        """
+        Creates an independent, editable copy of the grid.
+
+        Returns:
+            Grid: The copy.
+        """
+        costs = None if self.costs is None else self.costs.copy()
+        return Grid(self.rows, self.cols, self.cells.copy(), costs)
+
+
+def as_grid(grid):
+    """
+    Coerces a Grid or a plain 2D sequence of barrier flags to a Grid.
+
+    Args:
+        grid (Grid | list): The grid to coerce.
+
+    Returns:
+        Grid: The grid itself, or a new Grid built from the 2D sequence.
+    """
+    if isinstance(grid, Grid):
+        return grid
+    return Grid.from_rows(grid)
@@ -0,0 +1,534 @@
+# hierarchical.py
+
+import heapq
+import time
+import numpy as np
+import probes
+from grid import as_grid, FREE, MIN_COST
+from components import connected
+from search import HEADLESS, INF, make_metrics
+
+# Side length of a cluster in cells
+CLUSTER_SIZE = 16
+
+# Border segments at least this long get an entrance at each end instead of one in the middle
+LONG_SEGMENT = 6
+
+# Distance of cells a cluster search did not reach, large enough to never win a comparison
+UNREACHED = 1 << 40
+
+
+def entrance_offsets(both, size):
+    """
+    Places entrances along a stack of cluster borders.
+
+    A border is cut into segments of consecutive positions that are free on
+    both sides, never crossing a cluster corner. A short segment gets one
+    entrance in its middle, a long one an entrance at each end.
+
+    Args:
+        both (numpy.ndarray): (lines, length) bool array, True where both sides of a border are free.
+        size (int): Cluster size along the border; segments are cut at multiples of it.
+
+    Returns:
+        tuple: (lines, offsets) int arrays locating every entrance in both.
+    """
+    length = both.shape[1]
+    cut = np.arange(length) % size == 0
+    before = np.zeros_like(both)
+    before[:, 1:] = both[:, :-1]
+    after = np.zeros_like(both)
+    after[:, :-1] = both[:, 1:]
+    start_lines, starts = np.nonzero(both & (~before | cut))
+    _, ends = np.nonzero(both & (~after | np.roll(cut, -1)))
+    long = ends - starts + 1 >= LONG_SEGMENT
+    lines = np.concatenate((start_lines[~long], start_lines[long], start_lines[long]))
+    offsets = np.concatenate(((starts + ends)[~long] // 2, starts[long], ends[long]))
+    return lines, offsets
+
+
+class HPAStar:
+    """
+    Hierarchical Path-Finding A* (HPA*): a near-optimal planner for very large grids.
+
+    The grid is split into square clusters. Wherever two neighboring clusters
+    share free border cells, entrances join them in an abstract graph, and
+    inside each cluster the entrances are joined by their shortest distances
+    within the cluster. A query links the start and goal to the entrances of
+    their clusters, runs A* on the small abstract graph and then refines each
+    abstract edge into cells with a search confined to one cluster.
+
+    Entrances are found for the whole grid at once; the distances inside a
+    cluster are only worked out the first time a query reaches it. The planner
+    is kept on its grid through Grid.derived, and an edit only marks its own
+    cluster dirty: the next query rescans that cluster's borders and forgets
+    the distances of the clusters whose entrances changed.
+
+    Attributes:
+        grid (Grid): The grid being planned on.
+        size (int): Side length of a cluster in cells.
+        cluster_cols (int): Number of clusters across the grid.
+        expanded_nodes (int): Cells and abstract nodes expanded by the current query.
+    """
+
+    def __init__(self, grid, size=CLUSTER_SIZE):
+        """
+        Initializes an HPAStar and finds the entrances of every cluster.
+
+        Args:
+            grid (Grid): The grid to plan on.
+            size (int): Side length of a cluster in cells.
+        """
+        self.grid = grid
+        self.size = size
+        self.cluster_cols = -(-grid.cols // size)
+        self.borders = {}  # (cluster, cluster) -> list of entrance (cell, cell) pairs
+        self.partners = {}  # Entrance cell -> cells across a border it is joined to
+        self.graphs = {}  # Cluster -> {entrance: [(entrance, cost), ...]}, built on demand
+        self.routes = {}  # Cluster -> {(entrance, entrance): cells}, edges between entrances already refined
+        self.dirty = set()
+        self.expanded_nodes = 0
+        self.build()
+
+    def cluster(self, index):
+        """
+        Gets the cluster of a cell.
+
+        Args:
+            index (int): Flat index of the cell.
+
+        Returns:
+            int: The cluster number, row-major over the clusters.
+        """
+        row, col = divmod(index, self.grid.cols)
+        return (row // self.size) * self.cluster_cols + col // self.size
+
+    def bounds(self, cluster):
+        """
+        Gets the cells covered by a cluster.
+
+        Args:
+            cluster (int): The cluster number.
+
+        Returns:
+            tuple: (first_row, end_row, first_col, end_col), end exclusive.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        row, col = cluster_row * self.size, cluster_col * self.size
+        return row, min(row + self.size, self.grid.rows), col, min(col + self.size, self.grid.cols)
+
+    def build(self):
+        """
+        Finds the entrances on every border between clusters.
+        """
+        grid = self.grid
+        cols = grid.cols
+        size = self.size
+        free = grid.cells == FREE
+        pairs = []
+
+        # Borders between a cluster and the one below it
+        border_rows = np.arange(size - 1, grid.rows - 1, size)
+        lines, offsets = entrance_offsets(free[border_rows] & free[border_rows + 1], size)
+        above = border_rows[lines] * cols + offsets
+        pairs.append((above, above + cols))
+
+        # Borders between a cluster and the one to its right
+        border_cols = np.arange(size - 1, cols - 1, size)
+        lines, offsets = entrance_offsets((free[:, border_cols] & free[:, border_cols + 1]).T, size)
+        left = offsets * cols + border_cols[lines]
+        pairs.append((left, left + 1))
+
+        for first, second in pairs:
+            for a, b in zip(first.tolist(), second.tolist()):
+                self.link(a, b)
+                self.borders.setdefault((self.cluster(a), self.cluster(b)), []).append((a, b))
+
+    def link(self, a, b):
+        """
+        Joins two entrance cells across a border.
+
+        Args:
+            a (int): Flat index of the cell on one side.
+            b (int): Flat index of the cell on the other side.
+        """
+        self.partners.setdefault(a, []).append(b)
+        self.partners.setdefault(b, []).append(a)
+
+    def unlink(self, a, b):
+        """
+        Removes the join between two entrance cells.
+
+        Args:
+            a (int): Flat index of the cell on one side.
+            b (int): Flat index of the cell on the other side.
+        """
+        for cell, other in ((a, b), (b, a)):
+            partners = self.partners[cell]
+            partners.remove(other)
+            if not partners:
+                del self.partners[cell]
+
+    def update(self, pos):
+        """
+        Marks the cluster of a cell whose barrier or cost changed.
+
+        Args:
+            pos (tuple): The (row, col) position that was edited.
+
+        Returns:
+            bool: Always True, so Grid keeps the planner instead of rebuilding it.
+        """
+        self.dirty.add(self.cluster(self.grid.index(pos)))
+        return True
+
+    def refresh(self):
+        """
+        Rescans the borders of every dirty cluster and drops the distances they invalidate.
+        """
+        grid = self.grid
+        cols = grid.cols
+        free = grid.cells == FREE
+        for cluster in self.dirty:
+            self.forget(cluster)
+            first_row, end_row, first_col, end_col = self.bounds(cluster)
+            borders = []
+            if end_row < grid.rows:  # Below
+                both = free[end_row - 1, first_col:end_col] & free[end_row, first_col:end_col]
+                cells = [(end_row - 1) * cols + first_col + offset for offset in entrance_offsets(both[None], self.size)[1].tolist()]
+                borders.append((cluster + self.cluster_cols, [(cell, cell + cols) for cell in cells]))
+            if first_row > 0:  # Above
+                both = free[first_row - 1, first_col:end_col] & free[first_row, first_col:end_col]
+                cells = [(first_row - 1) * cols + first_col + offset for offset in entrance_offsets(both[None], self.size)[1].tolist()]
+                borders.append((cluster - self.cluster_cols, [(cell, cell + cols) for cell in cells]))
+            if end_col < cols:  # Right
+                both = free[first_row:end_row, end_col - 1] & free[first_row:end_row, end_col]
+                cells = [(first_row + offset) * cols + end_col - 1 for offset in entrance_offsets(both[None], self.size)[1].tolist()]
+                borders.append((cluster + 1, [(cell, cell + 1) for cell in cells]))
+            if first_col > 0:  # Left
+                both = free[first_row:end_row, first_col - 1] & free[first_row:end_row, first_col]
+                cells = [(first_row + offset) * cols + first_col - 1 for offset in entrance_offsets(both[None], self.size)[1].tolist()]
+                borders.append((cluster - 1, [(cell, cell + 1) for cell in cells]))
+
+            for other, pairs in borders:
+                key = (min(cluster, other), max(cluster, other))
+                old = self.borders.get(key, [])
+                if old == pairs:
+                    continue
+                for a, b in old:
+                    self.unlink(a, b)
+                for a, b in pairs:
+                    self.link(a, b)
+                self.borders[key] = pairs
+                self.forget(other)  # Its entrances moved
+        self.dirty = set()
+
+    def forget(self, cluster):
+        """
+        Drops the distances and refined routes computed for a cluster.
+
+        Args:
+            cluster (int): The cluster number.
+        """
+        self.graphs.pop(cluster, None)
+        self.routes.pop(cluster, None)
+
+    def entrances(self, cluster):
+        """
+        Lists the entrance cells inside a cluster.
+
+        Args:
+            cluster (int): The cluster number.
+
+        Returns:
+            set: Flat indices of the cluster's entrance cells.
+        """
+        cluster_row, cluster_col = divmod(cluster, self.cluster_cols)
+        neighbors = []
+        if cluster_row > 0:
+            neighbors.append(cluster - self.cluster_cols)
+        neighbors.append(cluster + self.cluster_cols)
+        if cluster_col > 0:
+            neighbors.append(cluster - 1)
+        if cluster_col < self.cluster_cols - 1:
+            neighbors.append(cluster + 1)
+
+        cells = set()
+        for other in neighbors:
+            for a, b in self.borders.get((min(cluster, other), max(cluster, other)), ()):
+                cells.add(a if cluster < other else b)
+        return cells
+
+    def local_distances(self, cluster, sources, reverse=False):
+        """
+        Shortest distances from a few cells to every cell of their cluster, without leaving it.
+
+        All sources are relaxed together in one (sources, rows, cols) array: each
+        sweep lowers every cell to the cheapest of its neighbors plus the step
+        cost, until nothing changes. This handles terrain costs like Dijkstra
+        while doing the work in numpy instead of one heap operation per cell.
+
+        Args:
+            cluster (int): The cluster to stay in.
+            sources (list): Flat indices of the cells to measure from.
+            reverse (bool): Measure the cost of reaching each source instead of leaving it.
+
+        Returns:
+            numpy.ndarray: (sources, rows, cols) int64 distances over the cluster, UNREACHED where none.
+        """
+        grid = self.grid
+        first_row, end_row, first_col, end_col = self.bounds(cluster)
+        blocked = grid.cells[first_row:end_row, first_col:end_col] != FREE
+        if grid.costs is None:
+            costs = np.ones(blocked.shape, dtype=np.int64)
+        else:
+            costs = grid.costs[first_row:end_row, first_col:end_col].astype(np.int64)
+
+        dist = np.full((len(sources),) + blocked.shape, UNREACHED, dtype=np.int64)
+        for i, source in enumerate(sources):
+            row, col = divmod(source, grid.cols)
+            dist[i, row - first_row, col - first_col] = 0
+        while True:
+            # A step into a cell costs that cell; walking backwards it costs the cell stepped from
+            leaving = dist + costs if reverse else dist
+            around = np.full_like(dist, UNREACHED)
+            np.minimum(around[:, 1:], leaving[:, :-1], out=around[:, 1:])
+            np.minimum(around[:, :-1], leaving[:, 1:], out=around[:, :-1])
+            np.minimum(around[:, :, 1:], leaving[:, :, :-1], out=around[:, :, 1:])
+            np.minimum(around[:, :, :-1], leaving[:, :, 1:], out=around[:, :, :-1])
+            relaxed = np.minimum(dist, around if reverse else around + costs)
+            relaxed[:, blocked] = UNREACHED
+            if np.array_equal(relaxed, dist):
+                break
+            dist = relaxed
+        self.expanded_nodes += int(np.count_nonzero(dist < UNREACHED))
+        return dist
+
+    def distances_to(self, cluster, source, targets, reverse=False):
+        """
+        Gets the distances from one cell to some cells of its cluster.
+
+        Args:
+            cluster (int): The cluster to stay in.
+            source (int): Flat index of the cell to measure from.
+            targets (set): Flat indices of the cells to measure to.
+            reverse (bool): Measure the cost of reaching source from each target instead.
+
+        Returns:
+            dict: Maps each reachable target to its distance.
+        """
+        return self.read(cluster, self.local_distances(cluster, [source], reverse)[0], targets)
+
+    def read(self, cluster, dist, cells):
+        """
+        Looks up the distances of some cells in a cluster's distance array.
+
+        Args:
+            cluster (int): The cluster the array covers.
+            dist (numpy.ndarray): (rows, cols) distances over the cluster.
+            cells (iterable): Flat indices of cells in the cluster.
+
+        Returns:
+            dict: Maps each reachable cell to its distance.
+        """
+        first_row, _, first_col, _ = self.bounds(cluster)
+        found = {}
+        for cell in cells:
+            row, col = divmod(cell, self.grid.cols)
+            distance = int(dist[row - first_row, col - first_col])
+            if distance < UNREACHED:
+                found[cell] = distance
+        return found
+
+    def graph(self, cluster):
+        """
+        Gets the shortest distances between the entrances of a cluster, computing them on first use.
+
+        Args:
+            cluster (int): The cluster number.
+
+        Returns:
+            dict: Maps each entrance to a list of (entrance, cost) edges within the cluster.
+        """
+        graph = self.graphs.get(cluster)
+        if graph is None:
+            cells = sorted(self.entrances(cluster))
+            dist = self.local_distances(cluster, cells) if cells else None
+            graph = self.graphs[cluster] = {}
+            for i, cell in enumerate(cells):
+                found = self.read(cluster, dist[i], cells)
+                graph[cell] = [(other, cost) for other, cost in found.items() if other != cell]
+        return graph
+
+    def refine(self, first, second):
+        """
+        Expands one abstract edge into the cells it stands for.
+
+        Edges between two entrances are the same for every query and are kept
+        until their cluster changes. Edges from a query's start or to its goal
+        are refined again each time, so the cache stays bounded by the layout.
+
+        Args:
+            first (int): Flat index of the cell the edge leaves.
+            second (int): Flat index of the cell the edge enters.
+
+        Returns:
+            list: Flat indices of the cells after first, up to and including second.
+        """
+        if second in self.partners.get(first, ()):
+            return [second]
+        cluster = self.cluster(first)
+        routes = self.routes.setdefault(cluster, {})
+        fixed = first in self.partners and second in self.partners
+        if fixed and (first, second) in routes:
+            return routes[first, second]
+        grid = self.grid
+        cols = grid.cols
+        costs = grid.step_costs()
+        first_row, end_row, first_col, end_col = self.bounds(cluster)
+        dist = self.local_distances(cluster, [first])[0]
+
+        # Walk down the distances from second: some neighbor is always exactly one step cheaper
+        cells = []
+        current = second
+        while current != first:
+            cells.append(current)
+            row, col = divmod(current, cols)
+            remaining = dist[row - first_row, col - first_col] - (MIN_COST if costs is None else costs[current])
+            for d_row, d_col in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if first_row <= row + d_row < end_row and first_col <= col + d_col < end_col:
+                    if dist[row + d_row - first_row, col + d_col - first_col] == remaining:
+                        current += d_row * cols + d_col
+                        break
+        cells.reverse()
+        if fixed:
+            routes[first, second] = cells
+        return cells
+
+    def plan(self, start, end, observer=HEADLESS):
+        """
+        Plans a path on the abstract graph and refines it into cells.
+
+        Args:
+            start (tuple): Starting (row, col) position.
+            end (tuple): Goal (row, col) position.
+            observer (SearchObserver): Receives progress events for the abstract nodes.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        start_time = time.perf_counter()
+        stats = probes.begin("HPA_star")
+        self.expanded_nodes = 0
+        if self.dirty:
+            self.refresh()
+        grid = self.grid
+        cols = grid.cols
+        costs = grid.step_costs()
+        scale = grid.min_cost()
+        source = grid.index(start)
+        target = grid.index(end)
+        end_row, end_col = end
+
+        # Temporary edges linking the start and goal to the entrances of their clusters
+        start_cluster, end_cluster = self.cluster(source), self.cluster(target)
+        start_targets = self.entrances(start_cluster)
+        if start_cluster == end_cluster:
+            start_targets.add(target)
+        start_edges = list(self.distances_to(start_cluster, source, start_targets).items())
+        end_edges = self.distances_to(end_cluster, target, self.entrances(end_cluster), reverse=True)
+
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        if stats is not None:
+            heappush, heappop = stats.heap(heappush, heappop)
+
+        g_score = {source: 0}
+        parents = {source: source}
+        closed = set()
+        count = 0
+        # Ties on f go to the deeper node, or A* would fan out over every equally short route
+        open_set = [(abs(start[0] - end_row) + abs(start[1] - end_col), 0, count, source)]
+        if stats is not None:
+            stats.opened(len(open_set))
+
+        while open_set:
+            current = heappop(open_set)[3]
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expanded_nodes += 1
+            if current == target:
+                break
+
+            edges = [
+                (partner, MIN_COST if costs is None else costs[partner]) for partner in self.partners.get(current, ())
+            ]
+            if current == source:
+                edges += start_edges
+            else:
+                edges += self.graph(self.cluster(current)).get(current, [])
+            if current in end_edges:
+                edges.append((target, end_edges[current]))
+            if stats is not None:
+                stats.neighbors += len(edges)
+
+            for neighbor, cost in edges:
+                temp_g_score = g_score[current] + cost
+                if temp_g_score < g_score.get(neighbor, INF):
+                    g_score[neighbor] = temp_g_score
+                    parents[neighbor] = current
+                    row, col = divmod(neighbor, cols)
+                    count += 1
+                    f_score = temp_g_score + (abs(row - end_row) + abs(col - end_col)) * scale
+                    heappush(open_set, (f_score, -temp_g_score, count, neighbor))
+                    observer.on_open(neighbor)
+            observer.on_close(current)
+
+        if target not in closed:
+            if stats is not None:
+                stats.finish(self.expanded_nodes, len(closed))
+            return None
+
+        if stats is not None:
+            stats.phase("path")
+        waypoints = [target]
+        while waypoints[-1] != source:
+            waypoints.append(parents[waypoints[-1]])
+        waypoints.reverse()
+        cells = [source]
+        for first, second in zip(waypoints, waypoints[1:]):
+            cells += self.refine(first, second)
+
+        total_time = time.perf_counter() - start_time
+        path = [grid.pos(cell) for cell in cells]
+        observer.on_path(path)
+        if stats is not None:
+            # Expanded nodes also count the cells settled by local searches; only abstract nodes are popped
+            stats.finish(self.expanded_nodes, len(closed))
+        return make_metrics(path, total_time, start, end, self.expanded_nodes, "HPA_star", grid.path_cost(path))
+
+
+def hpa_star(grid, start, end, observer=HEADLESS, cluster_size=CLUSTER_SIZE):
+    """
+    Plans with the HPA* planner stored on the grid, building it on first use.
+
+    The first call on a grid pays for finding the entrances; later calls reuse
+    them and the cluster distances computed so far, and after an edit only the
+    clusters around it are worked out again.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+        cluster_size (int): Side length of a cluster in cells.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if not connected(grid, start, end):
+        return None
+    planner = grid.derived(f"hpa_star_{cluster_size}", lambda grid: HPAStar(grid, cluster_size))
+    return planner.plan(start, end, observer)
@@ -1,96 +1,49 @@
-import random
 import time
-import pygame
-from game import Game
-from algorithms import Strategy
-from openpyxl import Workbook, load_workbook
-import copy
+from grid import Grid
+from algorithms import Strategy, ALGORITHMS
+from scenarios import make_scenario
+from runner import run_parallel
+from sinks import get_sink, close_all
 
 WIDTH = 800
-WIN = pygame.display.set_mode((WIDTH, WIDTH))
-pygame.display.set_caption("Path Finding Agent")
-
 ROWS = 50
 OBSTACLE_DENSITY = 0.3
 
 
-def generate_random_points(rows, grid):
+def open_window(width):
     """
-    Generates random start and end positions ensuring they are not on barriers.
+    Initializes pygame and opens the window, only once a visual mode is chosen.
+
+    pygame and the drawing modules are imported here and in the visual modes
+    rather than at the top, so the headless mode and anything importing this
+    module start without loading SDL or needing a display.
 
     Args:
-        rows (int): Number of rows in the grid.
-        grid (list): The grid containing Spot objects.
+        width (int): Width (and height) of the window.
 
     Returns:
-        tuple: Start and end positions as (row, col) tuples.
-    """
-    while True:
-        start = (random.randint(0, rows - 1), random.randint(0, rows - 1))
-        end = (random.randint(0, rows - 1), random.randint(0, rows - 1))
-        if (start != end and
-            not grid[start[0]][start[1]].is_barrier() and
-            not grid[end[0]][end[1]].is_barrier()):
-            return start, end
-
-
-def place_obstacles(grid, density, start_pos, end_pos):
+        pygame.Surface: The pygame window surface.
     """
-    Places obstacles on the grid based on the specified density, avoiding start and end positions.
-
-    Args:
-        grid (list): The grid containing Spot objects.
-        density (float): Obstacle density (0 to 1).
-        start_pos (tuple): Start position as (row, col).
-        end_pos (tuple): End position as (row, col).
-    """
-    total_cells = ROWS * ROWS
-    obstacle_count = int(total_cells * density)
-    obstacles = set()
-    while len(obstacles) < obstacle_count:
-        row, col = random.randint(0, ROWS - 1), random.randint(0, ROWS - 1)
-        if ((row, col) not in obstacles and
-            (row, col) != start_pos and
-            (row, col) != end_pos and
-            not grid[row][col].is_barrier()):
-            obstacles.add((row, col))
-            grid[row][col].make_barrier()
+    import pygame
+    pygame.init()
+    win = pygame.display.set_mode((width, width))
+    pygame.display.set_caption("Path Finding Agent")
+    return win
 
 
 def save_metrics_to_xlsx(metrics, filename="data.xlsx"):
     """
-    Saves the pathfinding metrics to an Excel (.xlsx) file.
+    Queues the pathfinding metrics for the Excel (.xlsx) file.
+
+    Rows are buffered by a sink and written in batches; the file itself is
+    saved once, when the program exits, instead of being rewritten per row.
 
     Args:
         metrics (dict): The dictionary of metrics to save.
         filename (str): The name of the Excel file.
     """
     try:
-        # Load the workbook if it exists; otherwise, create a new one
-        try:
-            workbook = load_workbook(filename)
-            sheet = workbook.active
-        except FileNotFoundError:
-            workbook = Workbook()
-            sheet = workbook.active
-            # Add header row
-            sheet.append(["Path", "Execution Time (s)", "Steps", "Manhattan Distance",
-                         "Expanded Nodes", "Algorithm", "Mode", "Run"])
-
-        # Append the metrics to the worksheet
-        sheet.append([
-            str(metrics["path"]),            # Path as a string
-            metrics["time"],                 # Execution time in seconds
-            metrics["steps"],                # Number of steps in the path
-            metrics["manhattan_distance"],   # Manhattan distance
-            metrics["expanded_nodes"],       # Number of expanded nodes
-            metrics["algorithm"],            # Algorithm type
-            metrics["mode"],                 # Mode used
-        ])
-
-        # Save the workbook
-        workbook.save(filename)
-        print(f"Metrics saved to {filename}")
+        get_sink(filename).add(metrics)
     except Exception as e:
         print(f"An error occurred while saving to {filename}: {e}")
 
@@ -106,27 +59,23 @@ def automated_tests(win, width, algorithm, num_tests=100, mode='2'):
         num_tests (int): Number of tests to run.
         mode (str): Mode identifier.
     """
+    from game import Game
     for run_id in range(1, num_tests + 1):
         print(f"Running test {run_id} on a new random grid...")
 
-        # Create a new grid for each test
-        grid = Game.make_grid(ROWS, width)
-        start_pos, end_pos = generate_random_points(ROWS, grid)
+        # Create a new random layout for each test
+        layout, start_pos, end_pos = make_scenario(ROWS, OBSTACLE_DENSITY, None)
 
-        # Initialize start, end, and obstacles on the grid
+        # Build the Spots to visualize, then mark start and end
+        grid = Game.make_grid(ROWS, width, layout)
         start = grid[start_pos[0]][start_pos[1]]
         end = grid[end_pos[0]][end_pos[1]]
         start.make_start()
         end.make_end()
-        place_obstacles(grid, OBSTACLE_DENSITY, start_pos, end_pos)
-
-        # Update neighbors for all spots in the grid
-        for row in grid:
-            for spot in row:
-                spot.update_neighbors(grid)
 
         # Run the algorithm
-        metrics = algorithm(lambda: Game.draw(win, grid, ROWS, width), grid, start, end)
+        metrics = algorithm(lambda: Game.draw(win, grid, ROWS, width), grid, start, end, layout=layout)
+        Game.draw(win, grid, ROWS, width, force=True)  # Show the final frame the frame limit may have skipped
         if metrics:
             metrics["mode"] = mode
             metrics["run"] = run_id
@@ -147,48 +96,35 @@ def run_all_algorithms_for_configurations(win, width, num_tests=100, mode='3'):
         num_tests (int): Number of tests to run.
         mode (str): Mode identifier.
     """
-    algorithms = ["a_star", "bfs", "dfs", "greedy_bfs"]
-
+    from game import Game
     for test_number in range(1, num_tests + 1):
         print(f"Running test {test_number} on a new random grid...")
 
-        # Create a new grid for this test
-        grid = Game.make_grid(ROWS, width)
-        start_pos, end_pos = generate_random_points(ROWS, grid)
-
-        # Initialize start, end, and obstacles on the grid
-        start = grid[start_pos[0]][start_pos[1]]
-        end = grid[end_pos[0]][end_pos[1]]
-        start.make_start()
-        end.make_end()
-        place_obstacles(grid, OBSTACLE_DENSITY, start_pos, end_pos)
+        # Create a new random layout for this test, shared read-only by every algorithm
+        layout, start_pos, end_pos = make_scenario(ROWS, OBSTACLE_DENSITY, None)
+        layout.freeze()
+        grid = Game.make_grid(ROWS, width, layout)
+        grid_start = grid[start_pos[0]][start_pos[1]]
+        grid_end = grid[end_pos[0]][end_pos[1]]
 
         # Run each algorithm on the grid
-        for algo_name in algorithms:
+        for algo_name in ALGORITHMS:
             try:
                 print(f"Running {algo_name} on test {test_number}...")
 
                 # Assign algorithm function
                 func = getattr(Strategy, algo_name)
 
-                # Deep copy the grid for the current algorithm
-                algo_grid = copy.deepcopy(grid)
-
-                # Reassign start and end in the copied grid
-                grid_start = algo_grid[start_pos[0]][start_pos[1]]
-                grid_end = algo_grid[end_pos[0]][end_pos[1]]
+                # Wipe the previous algorithm's colors and mark start and end again
+                Game.clear_search(grid)
                 grid_start.make_start()
                 grid_end.make_end()
 
-                # Update neighbors on the copied grid
-                for row in algo_grid:
-                    for spot in row:
-                        spot.update_neighbors(algo_grid)
-
                 # Measure execution time
                 start_time = time.time()
-                metrics = func(lambda: Game.draw(win, algo_grid, ROWS, width), algo_grid, grid_start, grid_end)
+                metrics = func(lambda: Game.draw(win, grid, ROWS, width), grid, grid_start, grid_end, layout=layout)
                 exec_time = time.time() - start_time
+                Game.draw(win, grid, ROWS, width, force=True)
 
                 if metrics:
                     metrics.update({
@@ -208,6 +144,28 @@ def run_all_algorithms_for_configurations(win, width, num_tests=100, mode='3'):
     print("All tests completed.")
 
 
+def run_all_algorithms_parallel(num_tests=100, mode='4', workers=None, seed=0):
+    """
+    Runs every algorithm on different random grids headless, spread across worker processes.
+
+    Args:
+        num_tests (int): Number of tests to run.
+        mode (str): Mode identifier.
+        workers (int): Number of worker processes, one per CPU by default.
+        seed (int): Seed of the sweep; the same seed reproduces the same grids.
+    """
+    results = run_parallel(num_tests, ROWS, OBSTACLE_DENSITY, seed=seed, workers=workers, mode=mode)
+    for test_number, algo_name, metrics, error in results:
+        if error:
+            print(f"Test {test_number}, Algorithm {algo_name}: Error occurred - {error}")
+        elif metrics:
+            save_metrics_to_xlsx(metrics)
+        else:
+            print(f"Test {test_number}, Algorithm {algo_name}: No path found.")
+
+    print("All tests completed.")
+
+
 def main(win, width, algorithm=Strategy.a_star, mode='1'):
     """
     Runs the main manual mode where users can interactively place obstacles, start, and end points.
@@ -218,7 +176,10 @@ def main(win, width, algorithm=Strategy.a_star, mode='1'):
         algorithm (function): The pathfinding algorithm to execute.
         mode (str): Mode identifier.
     """
+    import pygame
+    from game import Game
     grid = Game.make_grid(ROWS, width)
+    layout = Grid(ROWS)  # Barriers mirrored from the Spots, so its indexes survive edits
     start = None
     end = None
     run_flag = True
@@ -235,17 +196,21 @@ def main(win, width, algorithm=Strategy.a_star, mode='1'):
                 if not start and spot != end:
                     start = spot
                     start.make_start()
+                    layout.set_barrier((row, col), False)
                 elif not end and spot != start:
                     end = spot
                     end.make_end()
+                    layout.set_barrier((row, col), False)
                 elif spot != end and spot != start:
                     spot.make_barrier()
+                    layout.set_barrier((row, col))
 
             elif pygame.mouse.get_pressed()[2]:  # Right mouse button
                 pos = pygame.mouse.get_pos()
                 row, col = Game.get_clicked_pos(pos, ROWS, width)
                 spot = grid[row][col]
                 spot.reset()
+                layout.set_barrier((row, col), False)
                 if spot == start:
                     start = None
                 elif spot == end:
@@ -253,11 +218,7 @@ def main(win, width, algorithm=Strategy.a_star, mode='1'):
 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE and start and end:
-                    for row in grid:
-                        for spot in row:
-                            spot.update_neighbors(grid)
-
-                    metrics = algorithm(lambda: Game.draw(win, grid, ROWS, width), grid, start, end)
+                    metrics = algorithm(lambda: Game.draw(win, grid, ROWS, width), grid, start, end, layout=layout)
 
                     if metrics:
                         metrics['mode'] = mode
@@ -271,24 +232,34 @@ def main(win, width, algorithm=Strategy.a_star, mode='1'):
                     start = None
                     end = None
                     grid = Game.make_grid(ROWS, width)
+                    layout = Grid(ROWS)
 
     pygame.quit()
 
 
 if __name__ == "__main__":
-    choice = input("Enter '1' for manual mode, '2' for automated tests, or '3' for automated multi-algorithm tests: ").strip()
-    mode = '1' if choice == '1' else ('2' if choice == '2' else '3')
-    pygame.init()
+    choice = input("Enter '1' for manual mode, '2' for automated tests, '3' for automated multi-algorithm tests, "
+                   "or '4' for headless parallel multi-algorithm tests: ").strip()
+    mode = choice if choice in ('1', '2', '3', '4') else '3'
+    win = None
     try:
         if choice == "1":
-            main(WIN, WIDTH, Strategy.greedy_bfs, mode=mode)
+            win = open_window(WIDTH)
+            main(win, WIDTH, Strategy.lpa_star, mode=mode)
         elif choice == "2":
-            automated_tests(WIN, WIDTH, Strategy.a_star, num_tests=5, mode=mode)
+            win = open_window(WIDTH)
+            automated_tests(win, WIDTH, Strategy.a_star, num_tests=5, mode=mode)
         elif choice == "3":
-            run_all_algorithms_for_configurations(WIN, WIDTH, num_tests=2, mode=mode)
+            win = open_window(WIDTH)
+            run_all_algorithms_for_configurations(win, WIDTH, num_tests=2, mode=mode)
+        elif choice == "4":
+            run_all_algorithms_parallel(num_tests=100, mode=mode)
         else:
             print("Invalid choice. Exiting.")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
     finally:
-        pygame.quit()
\ No newline at end of file
+        close_all()
+        if win is not None:
+            import pygame
+            pygame.quit()
\ No newline at end of file
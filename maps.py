@@ -0,0 +1,226 @@
+# maps.py
+
+import argparse
+import os
+import struct
+import numpy as np
+from grid import Grid, BARRIER, FREE
+
+# First bytes of a grid file
+MAGIC = b"PFGRID"
+VERSION = 1
+
+# magic, version, rows, cols, occupancy encoding, has costs; padded to HEADER_SIZE
+HEADER = struct.Struct("<6sHIIBB")
+HEADER_SIZE = 64
+
+# Payload sections start on multiples of this many bytes, so every array is aligned
+ALIGNMENT = 64
+
+# Occupancy encodings: one byte per cell, or one bit per cell
+UINT8 = 0
+BITS = 1
+
+# Terrain characters of a MovingAI .map file that can be walked on
+PASSABLE = ".GS"
+
+
+def aligned(size):
+    """
+    Rounds a byte count up to the next multiple of ALIGNMENT.
+
+    Args:
+        size (int): Number of bytes.
+
+    Returns:
+        int: The padded size.
+    """
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def occupancy_size(rows, cols, encoding):
+    """
+    Gets the size of the occupancy section.
+
+    Args:
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        encoding (int): UINT8 or BITS.
+
+    Returns:
+        int: Number of bytes, without padding.
+    """
+    return rows * cols if encoding == UINT8 else -(-rows * cols // 8)
+
+
+def save_grid(grid, path, packed=False):
+    """
+    Writes a grid to a grid file.
+
+    The file is a HEADER_SIZE header followed by the occupancy, one byte or
+    one bit per cell in row order, then the costs, one byte per cell, when
+    the grid has any. Each section starts on an ALIGNMENT boundary.
+
+    Args:
+        grid (Grid): The grid.
+        path (str): Path of the file to write.
+        packed (bool): Store one bit per cell, 8 times smaller but unpacked into memory on load,
+            instead of one byte per cell, which loads without a copy.
+    """
+    encoding = BITS if packed else UINT8
+    cells = (grid.cells != FREE).astype(np.uint8)
+    occupancy = np.packbits(cells, bitorder="little") if packed else cells
+    header = HEADER.pack(MAGIC, VERSION, grid.rows, grid.cols, encoding, grid.costs is not None)
+    with open(path, "wb") as file:
+        file.write(header.ljust(HEADER_SIZE, b"\0"))
+        file.write(occupancy.tobytes())
+        file.write(b"\0" * (aligned(occupancy.size) - occupancy.size))
+        if grid.costs is not None:
+            file.write(np.ascontiguousarray(grid.costs).tobytes())
+
+
+def read_header(path):
+    """
+    Reads the header of a grid file.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        tuple: (rows, cols, encoding, has_costs).
+
+    Raises:
+        ValueError: If the file is not a grid file of this VERSION, or is shorter than its header says.
+    """
+    with open(path, "rb") as file:
+        data = file.read(HEADER.size)
+    if len(data) < HEADER.size or not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a grid file")
+    _, version, rows, cols, encoding, has_costs = HEADER.unpack(data)
+    if version != VERSION or encoding not in (UINT8, BITS):
+        raise ValueError(f"{path} has version {version} and encoding {encoding}, expected version {VERSION}")
+    expected = HEADER_SIZE + aligned(occupancy_size(rows, cols, encoding)) + (rows * cols if has_costs else 0)
+    if os.path.getsize(path) < expected:
+        raise ValueError(f"{path} is truncated: {os.path.getsize(path)} bytes, expected {expected}")
+    return rows, cols, encoding, bool(has_costs)
+
+
+def load_grid(path, writable=False):
+    """
+    Opens a grid file through a memory map.
+
+    A one-byte-per-cell occupancy and the costs are used in place: nothing is
+    read until a search touches it, so opening even a 10k x 10k map takes
+    milliseconds. Read-only maps of one file share the same pages of the OS
+    cache across every process that opens them. A bit-packed occupancy is
+    unpacked into memory once. Costs are checked to be in range when the
+    grid is built, which reads them.
+
+    Args:
+        path (str): Path of the file.
+        writable (bool): Map the file copy-on-write, so the grid can be edited without
+            changing the file, instead of returning a frozen grid.
+
+    Returns:
+        Grid: The grid, frozen unless writable.
+    """
+    rows, cols, encoding, has_costs = read_header(path)
+    mode = "c" if writable else "r"
+    size = occupancy_size(rows, cols, encoding)
+    if encoding == UINT8:
+        cells = np.memmap(path, np.uint8, mode, HEADER_SIZE, (rows, cols))
+    else:
+        packed = np.memmap(path, np.uint8, "r", HEADER_SIZE, (size,))
+        cells = np.unpackbits(packed, count=rows * cols, bitorder="little").reshape(rows, cols)
+    costs = None
+    if has_costs:
+        costs = np.memmap(path, np.uint8, mode, HEADER_SIZE + aligned(size), (rows, cols))
+    grid = Grid(rows, cols, cells, costs)
+    return grid if writable else grid.freeze()
+
+
+def read_movingai(path, passable=PASSABLE):
+    """
+    Imports a map in the MovingAI benchmark format (.map).
+
+    The file has a "type", "height" and "width" line, a "map" line, then one
+    line of terrain characters per row. Characters in passable are free cells
+    and every other one, such as "@", "O", "T" or "W", is a barrier.
+
+    Args:
+        path (str): Path of the .map file.
+        passable (str): Terrain characters that can be walked on.
+
+    Returns:
+        Grid: The grid.
+
+    Raises:
+        ValueError: If the header is missing or the rows do not match its size.
+    """
+    with open(path, "rb") as file:
+        data = file.read().replace(b"\r", b"")
+    header, separator, body = data.partition(b"\nmap\n")
+    if not separator:
+        raise ValueError(f"{path} has no 'map' line")
+    fields = dict(line.split(None, 1) for line in header.decode("ascii").splitlines() if line.strip())
+    rows, cols = int(fields["height"]), int(fields["width"])
+
+    chars = np.frombuffer(body, dtype=np.uint8)
+    if chars.size < rows * (cols + 1) - 1:
+        raise ValueError(f"{path} has fewer cells than its {rows} x {cols} header")
+    # One newline ends every row; resizing drops trailing lines or fills the last row's missing one
+    chars = np.resize(chars, rows * (cols + 1)).reshape(rows, cols + 1)
+    if (chars[:-1, cols] != ord("\n")).any():
+        raise ValueError(f"{path} has rows that are not {cols} characters wide")
+    terrain = np.full(256, BARRIER, dtype=np.uint8)
+    terrain[np.frombuffer(passable.encode("ascii"), dtype=np.uint8)] = FREE
+    return Grid(rows, cols, terrain[chars[:, :cols]])
+
+
+def read_movingai_scenarios(path):
+    """
+    Imports the queries of a MovingAI scenario file (.scen).
+
+    Args:
+        path (str): Path of the .scen file.
+
+    Returns:
+        list: (start, end, optimal_length) per query, with (row, col) positions and the
+        octile length listed by the file.
+    """
+    queries = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) < 9 or fields[0] == "version":
+                continue
+            start_col, start_row, end_col, end_row = (int(value) for value in fields[4:8])
+            queries.append(((start_row, start_col), (end_row, end_col), float(fields[8])))
+    return queries
+
+
+def open_map(path):
+    """
+    Opens a grid file, or imports a MovingAI .map file, by its extension.
+
+    Args:
+        path (str): Path of a .map file or of a grid file.
+
+    Returns:
+        Grid: A frozen grid.
+    """
+    if path.endswith(".map"):
+        return read_movingai(path).freeze()
+    return load_grid(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converts a MovingAI .map file, or a grid file, to a grid file.")
+    parser.add_argument("source", help=".map file or grid file")
+    parser.add_argument("target", help="grid file to write")
+    parser.add_argument("--packed", action="store_true", help="one bit per cell instead of one byte")
+    args = parser.parse_args()
+
+    grid = open_map(args.source)
+    save_grid(grid, args.target, args.packed)
+    print(f"Saved {grid.rows} x {grid.cols} grid to {args.target}")
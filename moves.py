@@ -0,0 +1,190 @@
+# moves.py
+
+import math
+
+SQRT2 = math.sqrt(2)
+
+# Corner-cutting rules for diagonal moves: how many of the two cells beside the
+# diagonal may be barriers
+NO_CORNERS = 0  # Both must be free, so a diagonal never clips a barrier's corner
+ONE_CORNER = 1  # One may be blocked, but the move can't squeeze between two barriers
+ANY_CORNER = 2  # Diagonal moves ignore the cells beside them
+
+
+def manhattan(d_row, d_col):
+    """
+    Manhattan distance, exact on an empty 4-connected grid.
+
+    Args:
+        d_row (int): Absolute row difference.
+        d_col (int): Absolute column difference.
+
+    Returns:
+        int: The distance.
+    """
+    return d_row + d_col
+
+
+def octile(d_row, d_col):
+    """
+    Octile distance, exact on an empty 8-connected grid with diagonal moves of length sqrt(2).
+
+    Args:
+        d_row (int): Absolute row difference.
+        d_col (int): Absolute column difference.
+
+    Returns:
+        float: The distance.
+    """
+    if d_row > d_col:
+        return d_row + (SQRT2 - 1) * d_col
+    return d_col + (SQRT2 - 1) * d_row
+
+
+def chebyshev(d_row, d_col):
+    """
+    Chebyshev distance, the number of king moves between two cells.
+
+    Args:
+        d_row (int): Absolute row difference.
+        d_col (int): Absolute column difference.
+
+    Returns:
+        int: The distance.
+    """
+    return d_row if d_row > d_col else d_col
+
+
+def euclidean(d_row, d_col):
+    """
+    Straight-line distance.
+
+    Args:
+        d_row (int): Absolute row difference.
+        d_col (int): Absolute column difference.
+
+    Returns:
+        float: The distance.
+    """
+    return math.hypot(d_row, d_col)
+
+
+HEURISTICS = {
+    "manhattan": manhattan,
+    "octile": octile,
+    "chebyshev": chebyshev,
+    "euclidean": euclidean,
+}
+
+
+class Moves:
+    """
+    A movement model: which neighbors a cell has, what each step costs, and a matching heuristic.
+
+    Straight steps have length 1 and diagonal steps length sqrt(2); entering a
+    cell costs its terrain cost times the length of the step. The neighbor
+    offsets are worked out once per grid width and kept in a table of plain
+    tuples, so the search loops only add them to a flat index.
+
+    Attributes:
+        connectivity (int): 4 or 8.
+        corners (int): NO_CORNERS, ONE_CORNER or ANY_CORNER, for 8-connectivity.
+        heuristic (function): Lower bound of the path length from absolute (row, col) differences.
+    """
+
+    def __init__(self, connectivity=4, corners=NO_CORNERS, heuristic=None):
+        """
+        Initializes a Moves.
+
+        Args:
+            connectivity (int): 4 or 8.
+            corners (int): NO_CORNERS, ONE_CORNER or ANY_CORNER, for 8-connectivity.
+            heuristic (str): Name in HEURISTICS. Defaults to "manhattan" for 4-connectivity
+                and "octile" for 8-connectivity.
+        """
+        if connectivity not in (4, 8):
+            raise ValueError(f"connectivity must be 4 or 8, got {connectivity}")
+        if corners not in (NO_CORNERS, ONE_CORNER, ANY_CORNER):
+            raise ValueError(f"unknown corner rule {corners}")
+        if heuristic is None:
+            heuristic = "manhattan" if connectivity == 4 else "octile"
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"unknown heuristic '{heuristic}', use one of {sorted(HEURISTICS)}")
+        if connectivity == 8 and heuristic == "manhattan":
+            raise ValueError("the manhattan heuristic overestimates diagonal moves, use octile, chebyshev or euclidean")
+        self.connectivity = connectivity
+        self.corners = corners
+        self.heuristic = HEURISTICS[heuristic]
+        self._tables = {}
+
+    def steps(self):
+        """
+        Lists the moves in the order the searches try them.
+
+        Straight moves come first, below/above/right/left as in Spot.update_neighbors.
+
+        Returns:
+            list: (d_row, d_col, length) for every move.
+        """
+        steps = [(1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1)]
+        if self.connectivity == 8:
+            steps += [(1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2)]
+        return steps
+
+    def table(self, cols):
+        """
+        Gets the neighbor offsets for grids of a given width.
+
+        Args:
+            cols (int): Number of columns of the grid.
+
+        Returns:
+            tuple: (delta, d_row, d_col, length, side_row, side_col) for every move, where
+            delta is the flat index offset and side_row/side_col are the flat offsets of
+            the two cells beside a diagonal move (0 for straight moves).
+        """
+        table = self._tables.get(cols)
+        if table is None:
+            table = self._tables[cols] = tuple(
+                (d_row * cols + d_col, d_row, d_col, length,
+                 d_row * cols if d_row and d_col else 0, d_col if d_row and d_col else 0)
+                for d_row, d_col, length in self.steps()
+            )
+        return table
+
+    def within_components(self):
+        """
+        Checks if every move stays inside a 4-connected component.
+
+        A diagonal move that needs at least one free cell beside it can always be
+        replaced by two straight ones, so the component index answers reachability.
+
+        Returns:
+            bool: False only for 8-connectivity that squeezes between two barriers.
+        """
+        return self.connectivity == 4 or self.corners != ANY_CORNER
+
+    def path_cost(self, grid, path):
+        """
+        Adds up the cost of following a path under this movement model.
+
+        Args:
+            grid (Grid): The grid the path is on.
+            path (list): The path as a list of (row, col) positions, start first.
+
+        Returns:
+            float: The sum of the costs of every step, terrain cost times step length.
+        """
+        if self.connectivity == 4:
+            return grid.path_cost(path)
+        costs = grid.step_costs()
+        total = 0
+        for (row, col), (next_row, next_col) in zip(path, path[1:]):
+            length = SQRT2 if row != next_row and col != next_col else 1
+            total += length if costs is None else costs[grid.index((next_row, next_col))] * length
+        return total
+
+
+# Default movement models
+FOUR = Moves(4)
+EIGHT = Moves(8)
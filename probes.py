@@ -0,0 +1,316 @@
+# probes.py
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Phases of a search, in the order they run
+PHASES = ("setup", "search", "path")
+
+_active = ContextVar("probe", default=None)
+
+
+class SearchStats:
+    """
+    Counters and phase timings of one instrumented search.
+
+    A search asks begin() for its stats once, during setup. When a probe is
+    active it swaps its local heap, queue and neighbor functions for the
+    counting wrappers made here; when none is, it keeps the plain ones, so an
+    uninstrumented search runs exactly the loop it always did.
+
+    Attributes:
+        algorithm (str): Name of the algorithm, as in its metrics.
+        pushes (int): Entries added to the open set, including the start.
+        pops (int): Entries taken off the open set.
+        stale (int): Popped entries skipped because their cell was already expanded or re-queued.
+        neighbors (int): Neighbor cells, moves or jumps looked at from expanded cells.
+        peak_open (int): Largest size of the open set, stale entries included.
+        expanded_nodes (int): Cells the search expanded.
+        phases (dict): Seconds spent in each of PHASES.
+    """
+
+    def __init__(self, algorithm):
+        """
+        Initializes the stats of a search that is starting its setup.
+
+        Args:
+            algorithm (str): Name of the algorithm.
+        """
+        self.algorithm = algorithm
+        self.pushes = 0
+        self.pops = 0
+        self.stale = 0
+        self.neighbors = 0
+        self.peak_open = 0
+        self.expanded_nodes = 0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self._phase = "setup"
+        self._since = time.perf_counter()
+
+    def phase(self, name):
+        """
+        Ends the current phase and starts another.
+
+        Args:
+            name (str): One of PHASES.
+        """
+        now = time.perf_counter()
+        self.phases[self._phase] += now - self._since
+        self._phase = name
+        self._since = now
+
+    def opened(self, size):
+        """
+        Records the entries the open set starts with and begins the search phase.
+
+        Args:
+            size (int): Number of entries the open set was created with.
+        """
+        self.pushes += size
+        self.peak_open = max(self.peak_open, size)
+        self.phase("search")
+
+    def finish(self, expanded_nodes, expansions=None):
+        """
+        Ends the last phase once the search returns.
+
+        Every pop that did not lead to an expansion was a stale entry.
+
+        Args:
+            expanded_nodes (int): Cells the search expanded, as in its metrics.
+            expansions (int): Pops that led to an expansion, expanded_nodes by default.
+        """
+        self.phase(self._phase)
+        self.expanded_nodes = expanded_nodes
+        self.stale = self.pops - (expanded_nodes if expansions is None else expansions)
+
+    def heap(self, heappush, heappop):
+        """
+        Wraps heap functions to count pushes and pops and track the open set's size.
+
+        Args:
+            heappush (function): heapq.heappush or an equivalent.
+            heappop (function): heapq.heappop or an equivalent.
+
+        Returns:
+            tuple: (heappush, heappop) replacements with the same signatures.
+        """
+        def push(heap, item):
+            heappush(heap, item)
+            self.pushes += 1
+            if len(heap) > self.peak_open:
+                self.peak_open = len(heap)
+
+        def pop(heap):
+            self.pops += 1
+            return heappop(heap)
+
+        return push, pop
+
+    def queue(self, container, pop):
+        """
+        Wraps the append and pop methods of a FIFO or LIFO open set.
+
+        Args:
+            container (deque | list): The open set.
+            pop (function): Its bound popleft or pop method.
+
+        Returns:
+            tuple: (append, pop) replacements for the bound methods.
+        """
+        append = container.append
+
+        def push(item):
+            append(item)
+            self.pushes += 1
+            if len(container) > self.peak_open:
+                self.peak_open = len(container)
+
+        def take():
+            self.pops += 1
+            return pop()
+
+        return push, take
+
+    def neighbors_of(self, neighbors):
+        """
+        Wraps a function listing the neighbors of a cell to count them.
+
+        Args:
+            neighbors (function): Takes a flat index and returns a list of flat indices.
+
+        Returns:
+            function: A replacement with the same signature.
+        """
+        def counted(index):
+            found = neighbors(index)
+            self.neighbors += len(found)
+            return found
+
+        return counted
+
+    def moves(self, table):
+        """
+        Wraps a Moves offset table to count the moves looked at, one addition per expanded cell.
+
+        Args:
+            table (tuple): The table from Moves.table().
+
+        Returns:
+            MoveCounter: An iterable over the same entries.
+        """
+        return MoveCounter(self, table)
+
+    def calls(self, function):
+        """
+        Wraps a function returning one neighbor, such as a jump, to count its calls.
+
+        Args:
+            function (function): The function to count.
+
+        Returns:
+            function: A replacement with the same signature.
+        """
+        def counted(*args):
+            self.neighbors += 1
+            return function(*args)
+
+        return counted
+
+    def timed(self, name, function):
+        """
+        Wraps a function so the time spent in it counts towards another phase.
+
+        Args:
+            name (str): One of PHASES, usually "path".
+            function (function): The function to time.
+
+        Returns:
+            function: A replacement with the same signature.
+        """
+        def timed(*args):
+            resumed = self._phase
+            self.phase(name)
+            try:
+                return function(*args)
+            finally:
+                self.phase(resumed)
+
+        return timed
+
+    def as_dict(self):
+        """
+        Gets the stats as plain values.
+
+        Returns:
+            dict: algorithm, every counter, and "<phase>_time" for every phase in seconds.
+        """
+        stats = {
+            "algorithm": self.algorithm,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "stale": self.stale,
+            "neighbors": self.neighbors,
+            "peak_open": self.peak_open,
+            "expanded_nodes": self.expanded_nodes,
+        }
+        stats.update({f"{name}_time": seconds for name, seconds in self.phases.items()})
+        return stats
+
+
+class MoveCounter:
+    """
+    An iterable over a Moves offset table that counts every full pass over it.
+    """
+
+    def __init__(self, stats, table):
+        self.stats = stats
+        self.table = table
+
+    def __iter__(self):
+        self.stats.neighbors += len(self.table)
+        return iter(self.table)
+
+
+class Probe:
+    """
+    Collects the stats of every search run while it is active.
+
+    Attributes:
+        records (list): One SearchStats per search, in the order they started.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty Probe.
+        """
+        self.records = []
+
+    def begin(self, algorithm):
+        """
+        Starts recording a search.
+
+        Args:
+            algorithm (str): Name of the algorithm.
+
+        Returns:
+            SearchStats: The stats the search fills in.
+        """
+        stats = SearchStats(algorithm)
+        self.records.append(stats)
+        return stats
+
+    def totals(self):
+        """
+        Adds up the records.
+
+        Returns:
+            dict: searches, the sum of every counter and phase time, and the largest peak_open.
+        """
+        totals = {"searches": len(self.records)}
+        for stats in self.records:
+            for key, value in stats.as_dict().items():
+                if key == "algorithm":
+                    continue
+                if key == "peak_open":
+                    totals[key] = max(totals.get(key, 0), value)
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+
+
+def begin(algorithm):
+    """
+    Starts the stats of a search if a probe is active. Searches call this once, during setup.
+
+    Args:
+        algorithm (str): Name of the algorithm.
+
+    Returns:
+        SearchStats: The stats to fill in, or None when nothing is being instrumented.
+    """
+    probe = _active.get()
+    return None if probe is None else probe.begin(algorithm)
+
+
+@contextmanager
+def instrument(probe=None):
+    """
+    Instruments every search run inside the with block, in this thread or task.
+
+    The counting wrappers make instrumented searches slower than plain ones,
+    so their metrics "time" should not be compared with uninstrumented runs.
+
+    Args:
+        probe (Probe): The probe to add records to, a new one by default.
+
+    Yields:
+        Probe: The probe collecting the records.
+    """
+    probe = Probe() if probe is None else probe
+    token = _active.set(probe)
+    try:
+        yield probe
+    finally:
+        _active.reset(token)
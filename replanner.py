@@ -0,0 +1,277 @@
+# replanner.py
+
+import heapq
+import time
+import probes
+from grid import as_grid
+from components import connected
+from search import HEADLESS, INF, make_metrics
+
+
+class LPAStar:
+    """
+    Lifelong Planning A* (LPA*): an A* whose search state survives grid edits.
+
+    Each cell keeps its g-score from the last plan and a one-step lookahead rhs
+    built from its neighbors. An edit only touches the rhs of the edited cell and
+    its neighbors; the next plan() then re-expands just the cells whose scores
+    changed instead of searching from scratch.
+
+    The planner is kept on its grid through Grid.derived, so Grid.set_barrier
+    feeds every edit into update() and nothing else has to track them.
+
+    Attributes:
+        grid (Grid): The grid being planned on.
+        start (int): Flat index of the start cell, or None before retarget().
+        end (int): Flat index of the goal cell, or None before retarget().
+    """
+
+    def __init__(self, grid):
+        """
+        Initializes an LPAStar without endpoints.
+
+        Args:
+            grid (Grid): The grid to plan on.
+        """
+        self.grid = grid
+        self.start = None
+        self.end = None
+        self.g_score = {}
+        self.rhs = {}
+        self.open_set = []
+        self.queued = {}  # Current key of every cell in the open set; other heap entries are stale
+        self.count = 0
+        self.expanded_nodes = 0
+        self.heappush = heapq.heappush  # Swapped for a counting one while a plan is instrumented
+
+    def retarget(self, start, end):
+        """
+        Sets the endpoints, dropping all search state if they changed.
+
+        Args:
+            start (tuple): Starting (row, col) position.
+            end (tuple): Goal (row, col) position.
+        """
+        source = self.grid.index(start)
+        target = self.grid.index(end)
+        if (source, target) == (self.start, self.end):
+            return
+        self.start = source
+        self.end = target
+        self.g_score = {}
+        self.rhs = {source: 0}
+        self.open_set = []
+        self.queued = {}
+        self.push(source)
+
+    def key(self, index):
+        """
+        Computes the priority of a cell.
+
+        Args:
+            index (int): Flat index of the cell.
+
+        Returns:
+            tuple: (min(g, rhs) + h, min(g, rhs)), compared lexicographically.
+        """
+        best = min(self.g_score.get(index, INF), self.rhs.get(index, INF))
+        row, col = divmod(index, self.grid.cols)
+        end_row, end_col = divmod(self.end, self.grid.cols)
+        return best + abs(row - end_row) + abs(col - end_col), best
+
+    def push(self, index):
+        """
+        Adds a cell to the open set, or moves it to its current key.
+
+        Args:
+            index (int): Flat index of the cell.
+        """
+        key = self.key(index)
+        self.queued[index] = key
+        self.count += 1
+        self.heappush(self.open_set, (key, self.count, index))
+
+    def around(self, index):
+        """
+        Lists the in-bounds 4-neighbors of a cell, barriers included.
+
+        Args:
+            index (int): Flat index of the cell.
+
+        Returns:
+            list: Flat indices of the neighboring cells.
+        """
+        grid = self.grid
+        cols = grid.cols
+        row, col = divmod(index, cols)
+        cells = []
+        if row < grid.rows - 1:
+            cells.append(index + cols)
+        if row > 0:
+            cells.append(index - cols)
+        if col < cols - 1:
+            cells.append(index + 1)
+        if col > 0:
+            cells.append(index - 1)
+        return cells
+
+    def update_vertex(self, index):
+        """
+        Recomputes a cell's rhs and queues it if its g-score no longer matches.
+
+        Args:
+            index (int): Flat index of the cell.
+        """
+        if index != self.start:
+            blocked = self.grid.blocked()
+            if blocked[index]:
+                self.rhs[index] = INF
+            else:
+                g_score = self.g_score
+                self.rhs[index] = min(
+                    (g_score.get(n, INF) + 1 for n in self.around(index) if not blocked[n]),
+                    default=INF,
+                )
+        if self.g_score.get(index, INF) != self.rhs.get(index, INF):
+            self.push(index)
+        else:
+            self.queued.pop(index, None)
+
+    def update(self, pos):
+        """
+        Repairs the lookahead values around a cell that changed between free and barrier.
+
+        Args:
+            pos (tuple): The (row, col) position that was edited.
+
+        Returns:
+            bool: Always True, so Grid keeps the planner instead of dropping it.
+        """
+        if self.start is None:
+            return True
+        index = self.grid.index(pos)
+        self.update_vertex(index)
+        for neighbor in self.around(index):
+            self.update_vertex(neighbor)
+        return True
+
+    def compute_shortest_path(self, observer=HEADLESS, stats=None):
+        """
+        Expands cells until the goal's g-score is consistent and no queued key is smaller.
+
+        Args:
+            observer (SearchObserver): Receives progress events.
+            stats (SearchStats): Counters to fill in, or None when not instrumented.
+        """
+        g_score = self.g_score
+        rhs = self.rhs
+        queued = self.queued
+        open_set = self.open_set
+        target = self.end
+        heappop = heapq.heappop
+        around = self.around
+        if stats is not None:
+            _, heappop = stats.heap(heapq.heappush, heappop)
+            around = stats.neighbors_of(around)
+
+        while open_set:
+            key, _, current = open_set[0]
+            if queued.get(current) != key:
+                heappop(open_set)  # Stale entry
+                continue
+            if key >= self.key(target) and rhs.get(target, INF) == g_score.get(target, INF):
+                break
+
+            heappop(open_set)
+            del queued[current]
+            self.expanded_nodes += 1
+
+            if g_score.get(current, INF) > rhs.get(current, INF):
+                g_score[current] = rhs[current]  # Overconsistent: the cell got cheaper
+            else:
+                g_score[current] = INF  # Underconsistent: the cell got dearer, re-derive it
+                self.update_vertex(current)
+            for neighbor in around(current):
+                self.update_vertex(neighbor)
+                if neighbor in queued:
+                    observer.on_open(neighbor)
+            observer.on_close(current)
+
+    def path(self):
+        """
+        Walks back from the goal along the cheapest neighbors.
+
+        Returns:
+            list: The path as a list of (row, col) positions, start first, or None if unreachable.
+        """
+        g_score = self.g_score
+        if g_score.get(self.end, INF) == INF:
+            return None
+        blocked = self.grid.blocked()
+        current = self.end
+        path = [self.grid.pos(current)]
+        while current != self.start:
+            current = min(
+                (n for n in self.around(current) if not blocked[n]),
+                key=lambda n: g_score.get(n, INF),
+            )
+            path.append(self.grid.pos(current))
+        path.reverse()
+        return path
+
+    def plan(self, observer=HEADLESS):
+        """
+        Brings the plan up to date with every edit since the last call.
+
+        Args:
+            observer (SearchObserver): Receives progress events.
+
+        Returns:
+            dict: A dictionary containing metrics, or None if no path is found.
+        """
+        start_time = time.perf_counter()
+        stats = probes.begin("LPA_star")
+        self.expanded_nodes = 0
+        if stats is not None:
+            self.heappush, _ = stats.heap(heapq.heappush, heapq.heappop)
+            stats.peak_open = len(self.open_set)  # Entries left by earlier plans and edits, not pushed now
+            stats.opened(0)
+        try:
+            self.compute_shortest_path(observer, stats)
+            if stats is not None:
+                stats.phase("path")
+            path = self.path()
+        finally:
+            if stats is not None:
+                self.heappush = heapq.heappush
+                stats.finish(self.expanded_nodes)
+        if path is None:
+            return None
+        total_time = time.perf_counter() - start_time
+        observer.on_path(path)
+        start, end = self.grid.pos(self.start), self.grid.pos(self.end)
+        return make_metrics(path, total_time, start, end, self.expanded_nodes, "LPA_star", self.grid.path_cost(path))
+
+
+def lpa_star(grid, start, end, observer=HEADLESS):
+    """
+    Plans with the LPA* planner stored on the grid, reusing its state from earlier calls.
+
+    The first call on a grid, or a call with new endpoints, is a full A*-like
+    search; later calls only repair the plan around barriers edited since.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    planner = grid.derived("lpa_star", LPAStar)
+    planner.retarget(start, end)
+    if not connected(grid, start, end):
+        return None
+    return planner.plan(observer)
@@ -0,0 +1,140 @@
+# runner.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from algorithms import Strategy, ALGORITHMS
+from batch import run_batch, group_by_start
+from moves import FOUR
+from scenarios import make_scenario
+from shared import attach, publish, scratch
+
+
+def job_seed(seed, test_number):
+    """
+    Derives the seed of one test's grid from the sweep seed.
+
+    Every algorithm of a test gets the same seed, and so the same grid, no
+    matter which worker process runs it or in which order.
+
+    Args:
+        seed (int): Seed of the whole sweep.
+        test_number (int): Number of the test.
+
+    Returns:
+        str: The seed of the test's grid.
+    """
+    return f"{seed}:{test_number}"
+
+
+def run_job(job):
+    """
+    Runs one algorithm on one generated grid, headless. Executed in worker processes.
+
+    Args:
+        job (tuple): (test_number, algo_name, seed, rows, density).
+
+    Returns:
+        tuple: (test_number, algo_name, metrics, error) where metrics is the metrics
+        dictionary or None, and error is the message of an exception or None.
+    """
+    test_number, algo_name, seed, rows, density = job
+    try:
+        layout, start, end = make_scenario(rows, density, seed)
+        metrics = getattr(Strategy, algo_name)(None, layout, start, end)
+        return test_number, algo_name, metrics, None
+    except Exception as e:
+        return test_number, algo_name, None, str(e)
+
+
+def run_parallel(num_tests, rows, density, algorithms=ALGORITHMS, seed=0, workers=None, mode='4'):
+    """
+    Runs every algorithm on num_tests random grids across a pool of worker processes.
+
+    Jobs are generated up front, one per (grid, algorithm) pair, and each worker
+    rebuilds its grid from the job's seed instead of receiving a pickled copy.
+    Results come back in job order whatever order the workers finish in.
+
+    Args:
+        num_tests (int): Number of random grids.
+        rows (int): Number of rows (and columns) of each grid.
+        density (float): Obstacle density (0 to 1).
+        algorithms (list): Names of the Strategy methods to run.
+        seed (int): Seed of the whole sweep; the same seed reproduces the same grids.
+        workers (int): Number of worker processes, os.cpu_count() by default.
+        mode (str): Mode identifier stored in the metrics.
+
+    Yields:
+        tuple: (test_number, algo_name, metrics, error) for every job, in order.
+            Successful metrics also carry "run", "mode" and "seed".
+    """
+    jobs = [
+        (test_number, algo_name, job_seed(seed, test_number), rows, density)
+        for test_number in range(1, num_tests + 1)
+        for algo_name in algorithms
+    ]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for test_number, algo_name, metrics, error in executor.map(run_job, jobs, chunksize=chunksize):
+            if metrics:
+                metrics.update({
+                    "run": test_number,
+                    "algorithm": algo_name,
+                    "mode": mode,
+                    "seed": job_seed(seed, test_number),
+                })
+            yield test_number, algo_name, metrics, error
+
+
+def run_chunk(job):
+    """
+    Answers one chunk of queries on a shared grid. Executed in worker processes.
+
+    Args:
+        job (tuple): (descriptor, queries, algorithm, moves) where descriptor comes from
+            SharedGrid.descriptor().
+
+    Returns:
+        list: One metrics dictionary or None per query, as run_batch() returns them.
+    """
+    descriptor, queries, algorithm, moves = job
+    grid = attach(descriptor)
+    return run_batch(grid, queries, algorithm, moves, scratch(grid.size))
+
+
+def run_queries(grid, queries, algorithm="a_star", moves=FOUR, workers=None):
+    """
+    Answers many (start, end) queries on one grid across a pool of worker processes.
+
+    The grid is published once into shared memory and every worker attaches
+    to it by name, so only the block's name travels with the jobs, however
+    large the map. Each worker keeps its attached grid, with derived data
+    such as the component index, and one set of search buffers for all its
+    chunks. Queries from the same start stay in one chunk, so run_batch()
+    can still answer them with one search.
+
+    Args:
+        grid (Grid): The grid.
+        queries (list): (start, end) pairs of (row, col) positions.
+        algorithm (str): Name of the Strategy method to answer with.
+        moves (Moves): Movement model for A* and Dijkstra, 4-connected by default.
+        workers (int): Number of worker processes, os.cpu_count() by default.
+
+    Returns:
+        list: One metrics dictionary per query, in query order, or None where no path exists.
+    """
+    workers = workers or os.cpu_count() or 1
+    groups = list(group_by_start(queries).values())
+    chunk_count = min(len(groups), workers * 4) or 1
+    chunks = [
+        [number for group in groups[first::chunk_count] for number in group]
+        for first in range(chunk_count)
+    ]
+    results = [None] * len(queries)
+    with publish(grid) as shared, ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = [(shared.descriptor(), [queries[number] for number in chunk], algorithm, moves) for chunk in chunks]
+        for chunk, answers in zip(chunks, executor.map(run_chunk, jobs)):
+            for number, metrics in zip(chunk, answers):
+                results[number] = metrics
+    return results
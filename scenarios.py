@@ -0,0 +1,41 @@
+# scenarios.py
+
+import random
+from generators import generate, numpy_rng
+
+
+def make_scenario(rows, density, seed):
+    """
+    Generates a random layout with reachable start and end points, reproducibly from a seed.
+
+    The same scenarios drive the visual modes and the parallel sweeps: the
+    "random" family of make_map() at the given density.
+
+    Args:
+        rows (int): Number of rows (and columns) in the grid.
+        density (float): Obstacle density (0 to 1).
+        seed (int | str): Seed for a private random.Random, so the same seed gives the same scenario;
+            None draws a fresh one.
+
+    Returns:
+        tuple: (layout, start, end) where layout is a Grid and start and end are (row, col) tuples.
+    """
+    return generate("random", rows, density, numpy_rng(random.Random(seed)))
+
+
+def make_map(family, rows, density, seed):
+    """
+    Generates a layout of one of the map FAMILIES with reachable start and end points, reproducibly from a seed.
+
+    See generators.generate() for the families.
+
+    Args:
+        family (str): One of FAMILIES.
+        rows (int): Number of rows (and columns) in the grid.
+        density (float): Obstacle density (0 to 1) of the "random", "rooms" and "noise" families.
+        seed (int | str): Seed for a private random.Random, so the same seed gives the same map.
+
+    Returns:
+        tuple: (layout, start, end) where layout is a Grid and start and end are (row, col) tuples.
+    """
+    return generate(family, rows, density, numpy_rng(random.Random(seed)))
@@ -0,0 +1,1128 @@
+# search.py
+
+import heapq
+from collections import deque
+import time
+import numpy as np
+import probes
+from grid import as_grid, FREE
+from components import connected
+from moves import FOUR, manhattan
+
+INF = float("inf")
+
+
+def h(p1, p2):
+    """
+    Heuristic function for pathfinding.
+
+    Args:
+        p1 (tuple): Coordinates of the first point (x1, y1).
+        p2 (tuple): Coordinates of the second point (x2, y2).
+
+    Returns:
+        int: The Manhattan distance between the two points.
+    """
+    x1, y1 = p1
+    x2, y2 = p2
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+class SearchObserver:
+    """
+    Receives progress events from a search. Every hook is a no-op, so a search
+    run without an observer (or with this base class) is fully headless.
+    """
+
+    def on_open(self, index):
+        """
+        Called when a cell is added to the frontier.
+
+        Args:
+            index (int): Flat index of the cell that was discovered.
+        """
+
+    def on_close(self, index):
+        """
+        Called after a cell has been expanded.
+
+        Args:
+            index (int): Flat index of the cell that was expanded.
+        """
+
+    def on_path(self, path):
+        """
+        Called once with the final path, after the timer has been stopped.
+
+        Args:
+            path (list): The path as a list of (row, col) positions, start first.
+        """
+
+
+HEADLESS = SearchObserver()
+
+
+def build_path(grid, parents, source, target):
+    """
+    Walks the parent links back from the target cell.
+
+    Args:
+        grid (Grid): The grid that was searched.
+        parents (dict | list): Maps a flat index to the flat index of its parent.
+        source (int): Flat index of the start cell.
+        target (int): Flat index of the goal cell.
+
+    Returns:
+        list: The path as a list of (row, col) positions, start first.
+    """
+    path = []
+    current = target
+    while current != source:
+        path.append(grid.pos(current))
+        current = parents[current]
+    path.append(grid.pos(source))
+    path.reverse()
+    return path
+
+
+def make_metrics(path, total_time, start, end, expanded_nodes, algorithm, cost=None):
+    """
+    Builds the metrics dictionary shared by every search.
+
+    Args:
+        path (list): The path as a list of (row, col) positions.
+        total_time (float): Search time in seconds.
+        start (tuple): Starting position.
+        end (tuple): Goal position.
+        expanded_nodes (int): Number of expanded nodes.
+        algorithm (str): Name of the algorithm.
+        cost (int): Total traversal cost of the path, one per move if not given.
+
+    Returns:
+        dict: The metrics dictionary.
+    """
+    return {
+        "path": path,
+        "time": total_time,
+        "steps": len(path),
+        "cost": len(path) - 1 if cost is None else cost,
+        "manhattan_distance": h(start, end),
+        "expanded_nodes": expanded_nodes,
+        "algorithm": algorithm
+    }
+
+
+def a_star(grid, start, end, observer=HEADLESS, moves=FOUR, scratch=None):
+    """
+    A* search, minimizing the total traversal cost of the path.
+
+    On a weighted grid the heuristic is scaled by the cheapest cell cost,
+    which keeps it admissible.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+        moves (Moves): Movement model and heuristic, 4-connected Manhattan by default.
+        scratch (Scratch): Optional buffers to reuse across searches on grids of the same size.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    return cheapest_path(grid, start, end, observer, moves, grid.min_cost(), "A_star", scratch)
+
+
+def dijkstra(grid, start, end, observer=HEADLESS, moves=FOUR, scratch=None):
+    """
+    Dijkstra's algorithm, minimizing the total traversal cost of the path.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+        moves (Moves): Movement model, 4-connected by default.
+        scratch (Scratch): Optional buffers to reuse across searches on grids of the same size.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    return cheapest_path(as_grid(grid), start, end, observer, moves, 0, "Dijkstra", scratch)
+
+
+class Scratch:
+    """
+    Per-cell search buffers that can be reused by consecutive searches on grids of one size.
+
+    Allocating the buffers costs O(cells) per search, which dominates short
+    queries on large grids. A search records every cell it writes to, and
+    reset() puts back just those cells.
+
+    Attributes:
+        size (int): Number of cells the buffers cover.
+        g_score (list): Cost of the best known route to each cell, INF if none.
+        parents (list): Flat index of the cell each cell was reached from, -1 if none.
+        closed (bytearray): Nonzero for cells that were expanded.
+        touched (list): Flat indices of the cells written to since the last reset.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes clean Scratch buffers.
+
+        Args:
+            size (int): Number of cells of the grids the buffers are for.
+        """
+        self.size = size
+        self.g_score = [INF] * size
+        self.parents = [-1] * size
+        self.closed = bytearray(size)
+        self.touched = []
+
+    def reset(self):
+        """
+        Restores every touched cell to its initial state.
+        """
+        g_score, parents, closed = self.g_score, self.parents, self.closed
+        for index in self.touched:
+            g_score[index] = INF
+            parents[index] = -1
+            closed[index] = 0
+        self.touched = []
+
+
+def cheapest_path(grid, start, end, observer, moves, scale, algorithm, scratch=None):
+    """
+    Finds the cheapest path to one goal with cheapest_paths().
+
+    Args:
+        grid (Grid): The grid.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events.
+        moves (Moves): Movement model and heuristic.
+        scale (int): Heuristic weight, at most the cheapest cell cost; 0 for Dijkstra.
+        algorithm (str): Name of the algorithm in the metrics.
+        scratch (Scratch): Optional buffers to reuse instead of allocating new ones.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    if moves.within_components() and not connected(grid, start, end):
+        return None
+    found = cheapest_paths(grid, start, [end], observer, moves, scale, 1, scratch)
+    if not found:
+        return None
+    _, cost, path, total_time, expanded_nodes = found[0]
+    return make_metrics(path, total_time, start, end, expanded_nodes, algorithm, cost)
+
+
+def cheapest_paths(grid, start, goals, observer, moves, scale, count, scratch=None):
+    """
+    The heap-based core shared by A*, Dijkstra and the searches with several goals.
+
+    The open set is a binary heap of (f, count, index) entries over flat cell
+    indices, where f is the g-score plus the heuristic to the closest goal
+    times scale. Neighbors come from the movement model's offset table, and a
+    step into a cell costs grid.step_costs() of that cell, or 1 on an
+    unweighted grid, times the step length.
+    Improving a cell's g-score pushes a fresh entry instead of updating the old
+    one, and outdated entries are skipped when popped (lazy deletion).
+
+    The smallest of several consistent heuristics is consistent too, so every
+    goal has its cheapest cost when it is expanded, and the search can carry on
+    from there to the next goal.
+
+    Args:
+        grid (Grid): The grid.
+        start (tuple): Starting (row, col) position.
+        goals (list): Goal (row, col) positions.
+        observer (SearchObserver): Receives progress events.
+        moves (Moves): Movement model and heuristic.
+        scale (int): Heuristic weight, at most the cheapest cell cost; 0 for Dijkstra.
+        count (int): Number of goals to reach before stopping.
+        scratch (Scratch): Optional buffers to reuse instead of allocating new ones.
+
+    Returns:
+        list: (goal, cost, path, seconds, expanded_nodes) for each goal reached, in the order
+        they were reached, where seconds and expanded_nodes are measured up to that goal.
+    """
+    start_time = time.perf_counter()
+    rows = grid.rows
+    cols = grid.cols
+    source = grid.index(start)
+    targets = {grid.index(goal): goal for goal in goals}
+    goal_positions = list(set(targets.values()))
+    single = len(goal_positions) == 1
+    end_row, end_col = goal_positions[0]
+    blocked = grid.blocked()
+    costs = grid.step_costs()
+    weighted = costs is not None
+    table = moves.table(cols)
+    corners = moves.corners
+    heuristic = moves.heuristic
+    inline = single and heuristic is manhattan  # Inlined below, it is the common case
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    build = build_path
+    stats = probes.begin("A_star" if scale else "Dijkstra")
+    if stats is not None:
+        heappush, heappop = stats.heap(heappush, heappop)
+        table = stats.moves(table)
+        build = stats.timed("path", build_path)
+
+    def estimate(row, col):
+        if single:
+            return heuristic(abs(row - end_row), abs(col - end_col)) * scale
+        return min(heuristic(abs(row - goal_row), abs(col - goal_col)) for goal_row, goal_col in goal_positions) * scale
+
+    # Fresh buffers are dropped afterwards, so only shared ones need their writes recorded
+    shared = scratch is not None and scratch.size == grid.size
+    if not shared:
+        scratch = Scratch(grid.size)
+    g_score = scratch.g_score
+    parents = scratch.parents
+    closed = scratch.closed
+    touched = scratch.touched
+    g_score[source] = 0
+    parents[source] = source
+    touched.append(source)
+
+    pushes = 0
+    open_set = [(estimate(*start), pushes, source)]
+    expanded_nodes = 0
+    found = []
+    if stats is not None:
+        stats.opened(len(open_set))
+
+    try:
+        while open_set:
+            current = heappop(open_set)[2]
+            if closed[current]:
+                continue  # Stale entry for a cell that was already expanded
+            closed[current] = 1
+            expanded_nodes += 1
+
+            if current in targets:
+                total_time = time.perf_counter() - start_time
+                path = build(grid, parents, source, current)
+                observer.on_path(path)
+                found.append((targets.pop(current), g_score[current], path, total_time, expanded_nodes))
+                if len(found) == count or not targets:
+                    break
+
+            current_g_score = g_score[current]
+            current_row, current_col = divmod(current, cols)
+            for delta, d_row, d_col, length, side_row, side_col in table:
+                row = current_row + d_row
+                col = current_col + d_col
+                if not (0 <= row < rows and 0 <= col < cols):
+                    continue
+                neighbor = current + delta
+                if blocked[neighbor]:
+                    continue
+                if side_row and (blocked[current + side_row] > 0) + (blocked[current + side_col] > 0) > corners:
+                    continue  # Diagonal cutting more barrier corners than allowed
+                temp_g_score = current_g_score + (costs[neighbor] * length if weighted else length)
+                if temp_g_score < g_score[neighbor]:
+                    parents[neighbor] = current
+                    g_score[neighbor] = temp_g_score
+                    if shared:
+                        touched.append(neighbor)
+                    pushes += 1
+                    if inline:
+                        f_score = temp_g_score + (abs(row - end_row) + abs(col - end_col)) * scale
+                    else:
+                        f_score = temp_g_score + estimate(row, col)
+                    heappush(open_set, (f_score, pushes, neighbor))
+                    observer.on_open(neighbor)
+
+            observer.on_close(current)
+    finally:
+        if shared:
+            scratch.reset()
+        if stats is not None:
+            stats.finish(expanded_nodes)
+
+    return found
+
+
+def bfs(grid, start, end, observer=HEADLESS):
+    """
+    Breadth-First Search (BFS).
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if not connected(grid, start, end):
+        return None
+    start_time = time.perf_counter()
+    stats = probes.begin("BFS")
+    source = grid.index(start)
+    target = grid.index(end)
+    queue = deque([source])
+    push, pop = queue.append, queue.popleft
+    neighbors = grid.neighbors
+    build = build_path
+    if stats is not None:
+        push, pop = stats.queue(queue, pop)
+        neighbors = stats.neighbors_of(neighbors)
+        build = stats.timed("path", build_path)
+    parents = [-1] * grid.size
+    parents[source] = source
+    expanded_nodes = 0
+    if stats is not None:
+        stats.opened(len(queue))
+
+    while queue:
+        current = pop()
+        expanded_nodes += 1
+
+        if current == target:
+            total_time = time.perf_counter() - start_time
+            path = build(grid, parents, source, target)
+            observer.on_path(path)
+            if stats is not None:
+                stats.finish(expanded_nodes)
+            return make_metrics(path, total_time, start, end, expanded_nodes, "BFS", grid.path_cost(path))
+
+        for neighbor in neighbors(current):
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                push(neighbor)
+                observer.on_open(neighbor)
+
+        observer.on_close(current)
+
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return None
+
+
+def bfs_paths(grid, start, goals, observer, count):
+    """
+    Breadth-First Search that keeps going until a number of goals are reached.
+
+    Args:
+        grid (Grid): The grid.
+        start (tuple): Starting (row, col) position.
+        goals (list): Goal (row, col) positions.
+        observer (SearchObserver): Receives progress events.
+        count (int): Number of goals to reach before stopping.
+
+    Returns:
+        list: (goal, cost, path, seconds, expanded_nodes) for each goal reached, like cheapest_paths().
+    """
+    start_time = time.perf_counter()
+    stats = probes.begin("BFS")
+    source = grid.index(start)
+    targets = {grid.index(goal): goal for goal in goals}
+    queue = deque([source])
+    push, pop = queue.append, queue.popleft
+    neighbors = grid.neighbors
+    build = build_path
+    if stats is not None:
+        push, pop = stats.queue(queue, pop)
+        neighbors = stats.neighbors_of(neighbors)
+        build = stats.timed("path", build_path)
+    parents = [-1] * grid.size
+    parents[source] = source
+    expanded_nodes = 0
+    found = []
+    if stats is not None:
+        stats.opened(len(queue))
+
+    while queue:
+        current = pop()
+        expanded_nodes += 1
+
+        if current in targets:
+            total_time = time.perf_counter() - start_time
+            path = build(grid, parents, source, current)
+            observer.on_path(path)
+            found.append((targets.pop(current), grid.path_cost(path), path, total_time, expanded_nodes))
+            if len(found) == count or not targets:
+                break
+
+        for neighbor in neighbors(current):
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                push(neighbor)
+                observer.on_open(neighbor)
+
+        observer.on_close(current)
+
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return found
+
+
+# Searches that can aim at several goals at once, and their metrics labels
+MULTI_GOAL = {"a_star": "A_star", "dijkstra": "Dijkstra", "bfs": "BFS"}
+
+
+def multi_goal(grid, start, goals, observer, algorithm, moves, count):
+    """
+    Runs one search from start towards several goals.
+
+    Goals in another component than the start are dropped up front, so the
+    search can stop as soon as the reachable ones are found instead of
+    exhausting the start's component looking for the others.
+
+    Args:
+        grid (Grid): The grid.
+        start (tuple): Starting (row, col) position.
+        goals (iterable): Goal (row, col) positions.
+        observer (SearchObserver): Receives progress events.
+        algorithm (str): "a_star", "dijkstra" or "bfs".
+        moves (Moves): Movement model for A* and Dijkstra.
+        count (int): Number of goals to reach before stopping, or None for all of them.
+
+    Returns:
+        list: (goal, cost, path, seconds, expanded_nodes) for each goal reached, like cheapest_paths().
+    """
+    if algorithm not in MULTI_GOAL:
+        raise ValueError(f"unknown multi-goal algorithm '{algorithm}', use one of {sorted(MULTI_GOAL)}")
+    if algorithm == "bfs" and moves.connectivity != 4:
+        raise ValueError("bfs is 4-connected, use a_star or dijkstra for other moves")
+    goals = list(dict.fromkeys(tuple(goal) for goal in goals))
+    if moves.within_components():
+        goals = [goal for goal in goals if connected(grid, start, goal)]
+    if not goals:
+        return []
+    count = len(goals) if count is None else count
+    if algorithm == "bfs":
+        return bfs_paths(grid, start, goals, observer, count)
+    scale = grid.min_cost() if algorithm == "a_star" else 0
+    return cheapest_paths(grid, start, goals, observer, moves, scale, count)
+
+
+def nearest_goal(grid, start, goals, observer=HEADLESS, algorithm="a_star", moves=FOUR):
+    """
+    Finds the path to whichever of several goals is cheapest to reach, with one search.
+
+    A* steers by the heuristic to the closest goal, so it still reaches the
+    nearest goal first; BFS and Dijkstra stop at the first goal they expand.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        goals (iterable): Goal (row, col) positions.
+        observer (SearchObserver): Receives progress events, headless by default.
+        algorithm (str): "a_star", "dijkstra" or "bfs".
+        moves (Moves): Movement model for A* and Dijkstra, 4-connected by default.
+
+    Returns:
+        dict: A dictionary containing metrics for the nearest goal, which is the last
+        position of the path, or None if no goal is reachable.
+    """
+    grid = as_grid(grid)
+    found = multi_goal(grid, start, goals, observer, algorithm, moves, 1)
+    if not found:
+        return None
+    goal, cost, path, total_time, expanded_nodes = found[0]
+    return make_metrics(path, total_time, start, goal, expanded_nodes, MULTI_GOAL[algorithm], cost)
+
+
+def paths_to_goals(grid, start, goals, observer=HEADLESS, algorithm="dijkstra", moves=FOUR):
+    """
+    Finds the paths to several goals with one search that stops once all of them are reached.
+
+    Dijkstra and BFS settle goals in order of distance; A* uses the heuristic
+    to the closest goal and pays for it with a heuristic per goal on every push,
+    so it suits a few clustered goals better than many scattered ones.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        goals (iterable): Goal (row, col) positions.
+        observer (SearchObserver): Receives progress events, headless by default.
+        algorithm (str): "a_star", "dijkstra" or "bfs".
+        moves (Moves): Movement model for A* and Dijkstra, 4-connected by default.
+
+    Returns:
+        dict: Maps every goal to its metrics dictionary, or None if it is unreachable. The time
+        and expanded nodes of each goal are those of the shared search when it got there.
+    """
+    grid = as_grid(grid)
+    goals = list(dict.fromkeys(tuple(goal) for goal in goals))
+    results = dict.fromkeys(goals)
+    for goal, cost, path, total_time, expanded_nodes in multi_goal(grid, start, goals, observer, algorithm, moves, None):
+        results[goal] = make_metrics(path, total_time, start, goal, expanded_nodes, MULTI_GOAL[algorithm], cost)
+    return results
+
+
+def dfs(grid, start, end, observer=HEADLESS):
+    """
+    Depth-First Search (DFS).
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if not connected(grid, start, end):
+        return None
+    start_time = time.perf_counter()
+    stats = probes.begin("DFS")
+    source = grid.index(start)
+    target = grid.index(end)
+    stack = [source]
+    push, pop = stack.append, stack.pop
+    neighbors = grid.neighbors
+    build = build_path
+    if stats is not None:
+        push, pop = stats.queue(stack, pop)
+        neighbors = stats.neighbors_of(neighbors)
+        build = stats.timed("path", build_path)
+    parents = [-1] * grid.size
+    parents[source] = source
+    expanded_nodes = 0
+    if stats is not None:
+        stats.opened(len(stack))
+
+    while stack:
+        current = pop()
+        expanded_nodes += 1
+
+        if current == target:
+            total_time = time.perf_counter() - start_time
+            path = build(grid, parents, source, target)
+            observer.on_path(path)
+            if stats is not None:
+                stats.finish(expanded_nodes)
+            return make_metrics(path, total_time, start, end, expanded_nodes, "DFS", grid.path_cost(path))
+
+        for neighbor in neighbors(current):
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                push(neighbor)
+                observer.on_open(neighbor)
+
+        observer.on_close(current)
+
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return None
+
+
+def greedy_bfs(grid, start, end, observer=HEADLESS, moves=FOUR):
+    """
+    Greedy Best-First Search.
+
+    Cells are expanded in order of their heuristic distance to the goal alone.
+    On a weighted grid the cost of reaching each open cell is tracked too, and
+    a cell that has not been expanded yet is re-parented whenever a cheaper
+    way into it shows up, so the path it returns avoids expensive detours
+    the search happened to find first.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+        moves (Moves): Movement model and heuristic, 4-connected Manhattan by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if moves.within_components() and not connected(grid, start, end):
+        return None
+    start_time = time.perf_counter()
+    stats = probes.begin("Greedy_BFS")
+    rows = grid.rows
+    cols = grid.cols
+    source = grid.index(start)
+    target = grid.index(end)
+    end_row, end_col = end
+    blocked = grid.blocked()
+    table = moves.table(cols)
+    corners = moves.corners
+    heuristic = moves.heuristic
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    build = build_path
+    if stats is not None:
+        heappush, heappop = stats.heap(heappush, heappop)
+        table = stats.moves(table)
+        build = stats.timed("path", build_path)
+    count = 0
+    open_set = [(heuristic(abs(start[0] - end_row), abs(start[1] - end_col)), count, source)]
+    parents = [-1] * grid.size
+    parents[source] = source
+    weighted = grid.costs is not None
+    if weighted:
+        costs = grid.step_costs()
+        g_score = [INF] * grid.size
+        g_score[source] = 0
+        closed = bytearray(grid.size)
+    expanded_nodes = 0
+    if stats is not None:
+        stats.opened(len(open_set))
+
+    while open_set:
+        current = heappop(open_set)[2]
+        expanded_nodes += 1
+
+        if current == target:
+            total_time = time.perf_counter() - start_time
+            path = build(grid, parents, source, target)
+            observer.on_path(path)
+            if stats is not None:
+                stats.finish(expanded_nodes)
+            return make_metrics(path, total_time, start, end, expanded_nodes, "Greedy_BFS", moves.path_cost(grid, path))
+
+        if weighted:
+            closed[current] = 1
+        current_row, current_col = divmod(current, cols)
+        for delta, d_row, d_col, length, side_row, side_col in table:
+            row = current_row + d_row
+            col = current_col + d_col
+            if not (0 <= row < rows and 0 <= col < cols):
+                continue
+            neighbor = current + delta
+            if blocked[neighbor]:
+                continue
+            if side_row and (blocked[current + side_row] > 0) + (blocked[current + side_col] > 0) > corners:
+                continue  # Diagonal cutting more barrier corners than allowed
+            if parents[neighbor] < 0:
+                parents[neighbor] = current
+                if weighted:
+                    g_score[neighbor] = g_score[current] + costs[neighbor] * length
+                count += 1
+                heappush(open_set, (heuristic(abs(row - end_row), abs(col - end_col)), count, neighbor))
+                observer.on_open(neighbor)
+            elif weighted and not closed[neighbor] and g_score[current] + costs[neighbor] * length < g_score[neighbor]:
+                # Cheaper way into a cell still waiting in the open set; its priority is unchanged
+                g_score[neighbor] = g_score[current] + costs[neighbor] * length
+                parents[neighbor] = current
+
+        observer.on_close(current)
+
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return None
+
+
+def join_paths(grid, forward_parents, backward_parents, source, target, meet):
+    """
+    Joins the two halves of a bidirectional search at the cell where they met.
+
+    Args:
+        grid (Grid): The grid that was searched.
+        forward_parents (list): Parent links of the search from the start.
+        backward_parents (list): Parent links of the search from the goal.
+        source (int): Flat index of the start cell.
+        target (int): Flat index of the goal cell.
+        meet (int): Flat index of the meeting cell.
+
+    Returns:
+        list: The path as a list of (row, col) positions, start first.
+    """
+    path = build_path(grid, forward_parents, source, meet)
+    current = meet
+    while current != target:
+        current = backward_parents[current]
+        path.append(grid.pos(current))
+    return path
+
+
+def bidirectional_bfs(grid, start, end, observer=HEADLESS):
+    """
+    Bidirectional Breadth-First Search.
+
+    Grows one BFS from the start and one from the goal, always expanding a full
+    level of the smaller frontier. The level on which the frontiers first touch
+    is finished before stopping so the shortest of its meeting points is used.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if not connected(grid, start, end):
+        return None
+    start_time = time.perf_counter()
+    stats = probes.begin("Bidirectional_BFS")
+    neighbors = grid.neighbors
+    join = join_paths
+    if stats is not None:
+        neighbors = stats.neighbors_of(neighbors)
+        join = stats.timed("path", join_paths)
+    source = grid.index(start)
+    target = grid.index(end)
+    forward = ([-1] * grid.size, [-1] * grid.size, [source])  # (parents, dist, frontier)
+    backward = ([-1] * grid.size, [-1] * grid.size, [target])
+    forward[0][source] = source
+    forward[1][source] = 0
+    backward[0][target] = target
+    backward[1][target] = 0
+    expanded_nodes = 0
+    best = INF
+    meet = source if source == target else -1
+    if stats is not None:
+        stats.opened(2)
+
+    while meet < 0 and forward[2] and backward[2]:
+        side, other = (forward, backward) if len(forward[2]) <= len(backward[2]) else (backward, forward)
+        parents, dist, frontier = side
+        other_dist = other[1]
+        next_frontier = []
+
+        for current in frontier:
+            expanded_nodes += 1
+            for neighbor in neighbors(current):
+                if dist[neighbor] < 0:
+                    parents[neighbor] = current
+                    dist[neighbor] = dist[current] + 1
+                    next_frontier.append(neighbor)
+                    observer.on_open(neighbor)
+                    if other_dist[neighbor] >= 0 and dist[neighbor] + other_dist[neighbor] < best:
+                        best = dist[neighbor] + other_dist[neighbor]
+                        meet = neighbor
+            observer.on_close(current)
+
+        if stats is not None:
+            # Frontiers are swapped a level at a time, so count them per level
+            stats.pops += len(frontier)
+            stats.pushes += len(next_frontier)
+            stats.peak_open = max(stats.peak_open, len(next_frontier) + len(other[2]))
+        side[2][:] = next_frontier
+
+    if meet < 0:
+        if stats is not None:
+            stats.finish(expanded_nodes)
+        return None
+
+    total_time = time.perf_counter() - start_time
+    path = join(grid, forward[0], backward[0], source, target, meet)
+    observer.on_path(path)
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return make_metrics(path, total_time, start, end, expanded_nodes, "Bidirectional_BFS", grid.path_cost(path))
+
+
+def bidirectional_a_star(grid, start, end, observer=HEADLESS):
+    """
+    Bidirectional A* search.
+
+    Runs A* from the start towards the goal and from the goal towards the start,
+    expanding from whichever open set is smaller. Every time one side reaches a
+    cell the other has scored, the joined path length is a candidate; the search
+    stops once the best open f-score on either side is no shorter than the best
+    candidate, since any shorter path would have to pass through both open sets.
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if not connected(grid, start, end):
+        return None
+    start_time = time.perf_counter()
+    stats = probes.begin("Bidirectional_A_star")
+    cols = grid.cols
+    source = grid.index(start)
+    target = grid.index(end)
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    neighbors = grid.neighbors
+    join = join_paths
+    if stats is not None:
+        heappush, heappop = stats.heap(heappush, heappop)
+        neighbors = stats.neighbors_of(neighbors)
+        join = stats.timed("path", join_paths)
+
+    def make_side(origin, goal):
+        g_score = [INF] * grid.size
+        g_score[origin] = 0
+        parents = [-1] * grid.size
+        parents[origin] = origin
+        return g_score, parents, bytearray(grid.size), [(h(grid.pos(origin), goal), 0, origin)], goal
+
+    forward = make_side(source, end)
+    backward = make_side(target, start)
+    count = 0
+    expanded_nodes = 0
+    best = 0 if source == target else INF
+    meet = source
+    if stats is not None:
+        stats.opened(2)
+
+    while forward[3] and backward[3]:
+        if max(forward[3][0][0], backward[3][0][0]) >= best:
+            break
+
+        side, other = (forward, backward) if len(forward[3]) <= len(backward[3]) else (backward, forward)
+        g_score, parents, closed, open_set, (goal_row, goal_col) = side
+        other_g_score = other[0]
+
+        current = heappop(open_set)[2]
+        if closed[current]:
+            continue
+        closed[current] = 1
+        expanded_nodes += 1
+
+        temp_g_score = g_score[current] + 1
+        for neighbor in neighbors(current):
+            if temp_g_score < g_score[neighbor]:
+                parents[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                row, col = divmod(neighbor, cols)
+                count += 1
+                heappush(open_set, (temp_g_score + abs(row - goal_row) + abs(col - goal_col), count, neighbor))
+                observer.on_open(neighbor)
+                if temp_g_score + other_g_score[neighbor] < best:
+                    best = temp_g_score + other_g_score[neighbor]
+                    meet = neighbor
+
+        observer.on_close(current)
+
+    if best == INF:
+        if stats is not None:
+            stats.finish(expanded_nodes)
+        return None
+
+    total_time = time.perf_counter() - start_time
+    path = join(grid, forward[1], backward[1], source, target, meet)
+    observer.on_path(path)
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return make_metrics(path, total_time, start, end, expanded_nodes, "Bidirectional_A_star", grid.path_cost(path))
+
+
+def scan_stops(stop, free):
+    """
+    For every cell, finds the distance to the next stop cell to its right.
+
+    Args:
+        stop (numpy.ndarray): 2D bool array of cells a rightward scan stops at.
+        free (numpy.ndarray): 2D bool array of free cells; a scan ends at the first blocked one.
+
+    Returns:
+        numpy.ndarray: int32 distances to the first free stop cell strictly to the right
+        that comes before any blocked cell, or -1 if there is none.
+    """
+    rows, cols = free.shape
+    out = np.full((rows, cols), -1, dtype=np.int32)
+    for col in range(cols - 2, -1, -1):
+        ahead = out[:, col + 1]
+        out[:, col] = np.where(stop[:, col + 1], 1, np.where(ahead >= 0, ahead + 1, -1))
+        out[~free[:, col + 1], col] = -1
+    return out
+
+
+def jump_tables(grid):
+    """
+    Precomputes goal-independent jump distances for jps().
+
+    A horizontal scan stops at a cell with a forced neighbor; a vertical scan
+    also stops at a cell from which a horizontal scan would stop somewhere.
+    Both only depend on the barriers, so they are cached on the grid until it
+    is edited and a query only has to add the goal on top.
+
+    Args:
+        grid (Grid): The grid.
+
+    Returns:
+        tuple: Flat int32 arrays of jump distances (right, left, down, up), -1 where none.
+    """
+    free = np.pad(grid.cells == FREE, 1, constant_values=False)
+    inner = free[1:-1, 1:-1]
+    up, down = free[:-2, 1:-1], free[2:, 1:-1]
+    left, right = free[1:-1, :-2], free[1:-1, 2:]
+
+    # A neighbor is forced when the cell it sits next to was blocked one step back
+    forced_right = (up & ~free[:-2, :-2]) | (down & ~free[2:, :-2])
+    forced_left = (up & ~free[:-2, 2:]) | (down & ~free[2:, 2:])
+    forced_down = (left & ~free[:-2, :-2]) | (right & ~free[:-2, 2:])
+    forced_up = (left & ~free[2:, :-2]) | (right & ~free[2:, 2:])
+
+    jump_right = scan_stops(forced_right, inner)
+    jump_left = scan_stops(forced_left[:, ::-1], inner[:, ::-1])[:, ::-1]
+    turns = (jump_right >= 0) | (jump_left >= 0)
+    jump_down = scan_stops((forced_down | turns).T, inner.T).T
+    jump_up = scan_stops((forced_up | turns).T[:, ::-1], inner.T[:, ::-1])[:, ::-1].T
+    return tuple(np.ascontiguousarray(table).ravel() for table in (jump_right, jump_left, jump_down, jump_up))
+
+
+def jps(grid, start, end, observer=HEADLESS):
+    """
+    Jump Point Search (JPS) for 4-connected grids with unit edge costs.
+
+    A* over jump points only: from each expanded cell the search jumps straight
+    ahead to the next cell with a forced neighbor, the goal, or (when moving
+    vertically) a row whose horizontal scan would stop at one of those. Every
+    cell in between is symmetric to the direct route and is never pushed to the
+    heap. The jumps are looked up in tables cached on the grid by jump_tables().
+
+    Args:
+        grid (Grid | list): The grid, or a 2D list where a truthy cell is a barrier.
+        start (tuple): Starting (row, col) position.
+        end (tuple): Goal (row, col) position.
+        observer (SearchObserver): Receives progress events, headless by default.
+
+    Returns:
+        dict: A dictionary containing metrics, or None if no path is found.
+    """
+    grid = as_grid(grid)
+    if not connected(grid, start, end):
+        return None
+    start_time = time.perf_counter()
+    stats = probes.begin("JPS")
+    cols = grid.cols
+    cells = grid.cells
+    jump_right, jump_left, jump_down, jump_up = grid.derived("jump_tables", jump_tables)
+    source = grid.index(start)
+    target = grid.index(end)
+    end_row, end_col = end
+
+    def jump_horizontal(row, col, dc):
+        index = row * cols + col
+        distance = int((jump_right if dc > 0 else jump_left)[index])
+        if row == end_row and (end_col - col) * dc > 0:
+            to_goal = abs(end_col - col)
+            if 0 <= distance < to_goal:
+                return index + distance * dc
+            low, high = sorted((col + dc, end_col))
+            if distance >= 0 or not cells[row, low:high + 1].any():
+                return target
+        return index + distance * dc if distance >= 0 else -1
+
+    def jump_vertical(row, col, dr):
+        index = row * cols + col
+        distance = int((jump_down if dr > 0 else jump_up)[index])
+        if (end_row - row) * dr > 0:
+            to_goal = abs(end_row - row)
+            if 0 <= distance < to_goal:
+                return index + distance * dr * cols
+            low, high = sorted((row + dr, end_row))
+            if distance == to_goal or not cells[low:high + 1, col].any():
+                # The scan reaches the goal's row: stop there if the goal is in line
+                low, high = sorted((col, end_col))
+                if not cells[end_row, low:high + 1].any():
+                    return end_row * cols + col
+        return index + distance * dr * cols if distance >= 0 else -1
+
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    if stats is not None:
+        heappush, heappop = stats.heap(heappush, heappop)
+        jump_horizontal = stats.calls(jump_horizontal)
+        jump_vertical = stats.calls(jump_vertical)
+
+    g_score = {source: 0}
+    parents = {source: source}
+    closed = set()
+
+    count = 0
+    open_set = [(h(start, end), count, source)]
+    expanded_nodes = 0
+    if stats is not None:
+        stats.opened(len(open_set))
+
+    while open_set:
+        current = heappop(open_set)[2]
+        if current in closed:
+            continue
+        closed.add(current)
+        expanded_nodes += 1
+
+        if current == target:
+            total_time = time.perf_counter() - start_time
+            if stats is not None:
+                stats.phase("path")
+            path = [grid.pos(target)]
+            while current != source:
+                parent = parents[current]
+                path.extend(line(grid.pos(current), grid.pos(parent))[1:])
+                current = parent
+            path.reverse()
+            observer.on_path(path)
+            if stats is not None:
+                stats.finish(expanded_nodes)
+            return make_metrics(path, total_time, start, end, expanded_nodes, "JPS", grid.path_cost(path))
+
+        row, col = divmod(current, cols)
+        parent_row, parent_col = divmod(parents[current], cols)
+        dr = (row > parent_row) - (row < parent_row)
+        dc = (col > parent_col) - (col < parent_col)
+
+        # Prune to the natural and forced directions of the move into this cell
+        if dc:
+            directions = ((0, dc), (1, 0), (-1, 0))
+        elif dr:
+            directions = ((dr, 0), (0, 1), (0, -1))
+        else:
+            directions = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+        for step_row, step_col in directions:
+            if step_col:
+                neighbor = jump_horizontal(row, col, step_col)
+            else:
+                neighbor = jump_vertical(row, col, step_row)
+            if neighbor < 0 or neighbor in closed:
+                continue
+
+            jump_row, jump_col = divmod(neighbor, cols)
+            temp_g_score = g_score[current] + abs(jump_row - row) + abs(jump_col - col)
+            if temp_g_score < g_score.get(neighbor, INF):
+                parents[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                count += 1
+                f_score = temp_g_score + abs(jump_row - end_row) + abs(jump_col - end_col)
+                heappush(open_set, (f_score, count, neighbor))
+                observer.on_open(neighbor)
+
+        observer.on_close(current)
+
+    if stats is not None:
+        stats.finish(expanded_nodes)
+    return None
+
+
+def line(p1, p2):
+    """
+    Lists the cells of a straight horizontal or vertical segment.
+
+    Args:
+        p1 (tuple): First (row, col) position.
+        p2 (tuple): Last (row, col) position, in the same row or column as p1.
+
+    Returns:
+        list: The positions from p1 to p2, both included.
+    """
+    (row, col), (end_row, end_col) = p1, p2
+    dr = (end_row > row) - (end_row < row)
+    dc = (end_col > col) - (end_col < col)
+    cells = [(row, col)]
+    while (row, col) != (end_row, end_col):
+        row += dr
+        col += dc
+        cells.append((row, col))
+    return cells
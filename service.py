@@ -0,0 +1,419 @@
+# service.py
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from batch import BATCH_ALGORITHMS, LABELS, run_batch
+from grid import Grid
+from moves import Moves
+from shared import attach, publish, scratch
+
+HOST = "127.0.0.1"
+PORT = 8765
+BATCH_WINDOW = 0.005  # Seconds a query waits for others on the same grid before its batch is sent
+MAX_BATCH = 256  # Queries that send a batch right away
+MAX_LINE = 1 << 30  # Longest request line, large enough for a grid upload
+SHUT_DOWN = "the service shut down before answering"  # Error of the queries close() drops
+
+
+def run_job(job):
+    """
+    Answers one batch of queries on one grid. Executed in worker processes.
+
+    Args:
+        job (tuple): (descriptor of the shared grid, queries, algorithm, moves options).
+
+    Returns:
+        tuple: (results, error) where results is the list from run_batch() and
+        error is the message of an exception or None.
+    """
+    descriptor, queries, algorithm, moves = job
+    try:
+        grid = attach(descriptor)
+        return run_batch(grid, queries, algorithm, Moves(**moves), scratch(grid.size)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def read_grid(message):
+    """
+    Builds a grid from an upload message.
+
+    Args:
+        message (dict): Either "cells", a 2D list where a truthy cell is a barrier, or
+            "rows", "cols" and "barriers", a list of [row, col] positions. "costs" may
+            hold a 2D list of per-cell costs.
+
+    Returns:
+        Grid: The new, frozen grid.
+    """
+    if "cells" in message:
+        cells = np.array(message["cells"], dtype=bool).astype(np.uint8)
+        if cells.ndim != 2:
+            raise ValueError("cells must be a 2D list")
+        rows, cols = cells.shape
+    else:
+        rows = int(message["rows"])
+        cols = int(message.get("cols", rows))
+        cells = np.zeros((rows, cols), dtype=np.uint8)
+        barriers = np.array(message.get("barriers", []), dtype=np.int64).reshape(-1, 2)
+        cells[barriers[:, 0], barriers[:, 1]] = 1
+    grid = Grid(rows, cols, cells, message.get("costs"))
+    grid.freeze()
+    return grid
+
+
+def read_position(grid, value, name):
+    """
+    Checks a position sent by a client.
+
+    Args:
+        grid (Grid): The grid the position is on.
+        value (list): The [row, col] position.
+        name (str): Name of the field, for the error message.
+
+    Returns:
+        tuple: The (row, col) position.
+    """
+    try:
+        pos = (int(value[0]), int(value[1]))
+    except (TypeError, ValueError, IndexError):
+        raise ValueError(f"{name} must be a [row, col] pair")
+    if len(value) != 2 or not grid.in_bounds(pos):
+        raise ValueError(f"{name} {value} is not on the {grid.rows}x{grid.cols} grid")
+    if grid.is_barrier(pos):
+        raise ValueError(f"{name} {value} is a barrier")
+    return pos
+
+
+class PlannerService:
+    """
+    A long-running local path-planning server speaking JSON Lines over TCP or a Unix socket.
+
+    Every request is one JSON object on its own line, and every reply one line
+    back. A client uploads a grid once, then sends any number of queries on
+    the same connection without waiting for the answers; each answer is
+    written as soon as its search finishes and carries the query's "id".
+
+    Queries on the same grid, algorithm and moves that arrive within
+    batch_window seconds of each other are answered by one run_batch() call in
+    a worker process, so queries sharing a start share a search and all of
+    them share the worker's search buffers and cached grid data. Uploaded
+    grids are published once into shared memory, and batches only carry the
+    name of the block, which each worker attaches to on its first batch.
+
+    Requests:
+        {"op": "grid", "grid": name, "cells": [[0, 1, ...], ...], "costs": [[...], ...]}
+        {"op": "grid", "grid": name, "rows": 100, "cols": 100, "barriers": [[row, col], ...]}
+        {"op": "path", "id": 1, "grid": name, "start": [row, col], "end": [row, col],
+         "algorithm": "a_star", "moves": {"connectivity": 8}}
+        {"op": "drop", "grid": name}
+        The algorithm is one of BATCH_ALGORITHMS, and only a_star and dijkstra accept moves.
+
+    Replies:
+        {"grid": name, "fingerprint": hex} to an upload, {"id": 1, "metrics": {...}} to
+        a query, with "metrics": null when no path exists, and {"id": ..., "error": message}
+        to anything that fails.
+
+    Attributes:
+        workers (int): Number of worker processes, 0 to search in a thread of the server process.
+        batch_window (float): Seconds a query waits for others on the same grid.
+        max_batch (int): Number of waiting queries that sends a batch right away.
+        grids (dict): Uploaded grids by name.
+        shared (dict): The SharedGrid of every grid in use, by fingerprint.
+    """
+
+    def __init__(self, workers=None, batch_window=BATCH_WINDOW, max_batch=MAX_BATCH):
+        """
+        Initializes a PlannerService.
+
+        Args:
+            workers (int): Number of worker processes, os.cpu_count() by default,
+                0 to search in a thread of the server process.
+            batch_window (float): Seconds a query waits for others on the same grid.
+            max_batch (int): Number of waiting queries that sends a batch right away.
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.grids = {}
+        self.shared = {}
+        self.running = {}  # Fingerprint -> batches sent to the workers and not answered yet
+        self.pending = {}  # (fingerprint, algorithm, moves) -> (grid, [(query, future)])
+        self.jobs = set()  # concurrent.futures.Future of every batch sent and not finished
+        self.executor = None
+
+    async def start(self, host=HOST, port=PORT, path=None):
+        """
+        Starts the worker pool and begins accepting connections.
+
+        Args:
+            host (str): Address to listen on.
+            port (int): TCP port to listen on, 0 for any free port.
+            path (str): Unix socket path; when given, host and port are ignored.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        if self.workers:
+            # Forked workers would inherit the sockets of open connections and keep them open
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path, limit=MAX_LINE)
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+
+    def close(self):
+        """
+        Shuts the worker pool down and frees the shared grids.
+        """
+        if self.executor is not None:
+            # Batches that have not started are dropped rather than run for nobody
+            for job in list(self.jobs):
+                job.cancel()
+            self.executor.shutdown()
+            self.executor = None
+        self.grids.clear()
+        for _, queued in self.pending.values():
+            for _, future in queued:
+                if not future.done():
+                    future.set_exception(ValueError(SHUT_DOWN))
+        self.pending.clear()
+        for shared in self.shared.values():
+            shared.close()
+        self.shared.clear()
+        self.running.clear()
+
+    async def handle(self, reader, writer):
+        """
+        Serves one client connection until it closes.
+
+        Args:
+            reader (asyncio.StreamReader): The connection's incoming stream.
+            writer (asyncio.StreamWriter): The connection's outgoing stream.
+        """
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self.reply(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def reply(self, line, writer):
+        """
+        Answers one request line and writes the reply.
+
+        Args:
+            line (bytes): The request, one JSON object.
+            writer (asyncio.StreamWriter): The connection to reply on.
+        """
+        request_id = None
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("a request must be a JSON object")
+            request_id = message.get("id")
+            response = await self.dispatch(message)
+        except Exception as e:
+            response = {"error": str(e)}
+        if request_id is not None:
+            response["id"] = request_id
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def dispatch(self, message):
+        """
+        Runs one request.
+
+        Args:
+            message (dict): The decoded request.
+
+        Returns:
+            dict: The reply.
+        """
+        op = message.get("op")
+        if op == "grid":
+            name = message.get("grid")
+            grid = read_grid(message)
+            fingerprint = grid.fingerprint()
+            name = fingerprint if name is None else name
+            if fingerprint not in self.shared:
+                self.shared[fingerprint] = publish(grid)
+            old = self.grids.get(name)
+            self.grids[name] = self.shared[fingerprint].grid
+            if old is not None:
+                self.unpublish(old.fingerprint())
+            return {"grid": name, "fingerprint": fingerprint}
+        if op == "path":
+            return {"metrics": await self.plan(message)}
+        if op == "drop":
+            old = self.grids.pop(message.get("grid"), None)
+            if old is not None:
+                self.unpublish(old.fingerprint())
+            return {"grid": message.get("grid")}
+        raise ValueError(f"unknown op '{op}', use grid, path or drop")
+
+    async def plan(self, message):
+        """
+        Queues one path query and waits for its batch to be answered.
+
+        Args:
+            message (dict): A "path" request.
+
+        Returns:
+            dict: The metrics dictionary, or None if no path exists.
+        """
+        grid = self.grids.get(message.get("grid"))
+        if grid is None:
+            raise ValueError(f"no grid named '{message.get('grid')}', upload it first")
+        start = read_position(grid, message.get("start"), "start")
+        end = read_position(grid, message.get("end"), "end")
+        algorithm = message.get("algorithm", "a_star")
+        if algorithm not in BATCH_ALGORITHMS:
+            raise ValueError(f"unknown algorithm '{algorithm}', use one of {', '.join(BATCH_ALGORITHMS)}")
+        moves = message.get("moves") or {}
+        if moves and algorithm not in LABELS:
+            raise ValueError(f"moves only apply to {' and '.join(LABELS)}, not {algorithm}")
+        Moves(**moves)  # Reject bad options here rather than failing the whole batch
+
+        key = (grid.fingerprint(), algorithm, tuple(sorted(moves.items())))
+        future = asyncio.get_running_loop().create_future()
+        if key not in self.pending:
+            self.pending[key] = (grid, [])
+            asyncio.get_running_loop().call_later(self.batch_window, self.flush, key)
+        queued = self.pending[key][1]
+        queued.append(((start, end), future))
+        if len(queued) >= self.max_batch:
+            self.flush(key)
+        return await future
+
+    def flush(self, key):
+        """
+        Sends the waiting queries of one grid, algorithm and moves to the worker pool.
+
+        Args:
+            key (tuple): (fingerprint, algorithm, moves) of the batch.
+        """
+        if key not in self.pending:
+            return
+        _, queued = self.pending.pop(key)
+        fingerprint, algorithm, moves = key
+        job = (self.shared[fingerprint].descriptor(), [query for query, _ in queued], algorithm, dict(moves))
+        self.running[fingerprint] = self.running.get(fingerprint, 0) + 1
+        submitted = self.executor.submit(run_job, job)
+        self.jobs.add(submitted)
+        submitted.add_done_callback(self.jobs.discard)
+        done = asyncio.wrap_future(submitted)
+        done.add_done_callback(lambda done: self.finished(done, fingerprint, [future for _, future in queued]))
+
+    def finished(self, done, fingerprint, futures):
+        """
+        Settles a finished batch and frees its shared grid if nothing uses it any more.
+
+        Args:
+            done (asyncio.Future): The finished run_job() call.
+            fingerprint (str): Fingerprint of the batch's grid.
+            futures (list): The futures of the batch's queries, in query order.
+        """
+        self.settle(done, futures)
+        remaining = self.running.pop(fingerprint, 1) - 1
+        if remaining:
+            self.running[fingerprint] = remaining
+        self.unpublish(fingerprint)
+
+    def unpublish(self, fingerprint):
+        """
+        Frees the shared memory of a grid once no name, waiting query or running batch uses it.
+
+        Workers may keep their mapping of the block until they attach other
+        grids, so its memory is returned to the system once they let it go.
+
+        Args:
+            fingerprint (str): Fingerprint of the grid.
+        """
+        in_use = (
+            fingerprint in self.running
+            or any(key[0] == fingerprint for key in self.pending)
+            or any(grid.fingerprint() == fingerprint for grid in self.grids.values())
+        )
+        if not in_use and fingerprint in self.shared:
+            self.shared.pop(fingerprint).close()
+
+    @staticmethod
+    def settle(done, futures):
+        """
+        Hands the answers of a finished batch to the queries waiting on it.
+
+        A batch cancelled by close() settles every query with an error, so no
+        client is left waiting.
+
+        Args:
+            done (asyncio.Future): The finished run_job() call.
+            futures (list): The futures of the batch's queries, in query order.
+        """
+        if done.cancelled():
+            results, error = None, SHUT_DOWN
+        else:
+            try:
+                results, error = done.result()
+            except Exception as e:
+                results, error = None, str(e)
+        for number, future in enumerate(futures):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(ValueError(error))
+            else:
+                future.set_result(results[number])
+
+
+async def serve(host=HOST, port=PORT, path=None, workers=None, batch_window=BATCH_WINDOW):
+    """
+    Runs a PlannerService until it is interrupted.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): TCP port to listen on.
+        path (str): Unix socket path; when given, host and port are ignored.
+        workers (int): Number of worker processes, os.cpu_count() by default.
+        batch_window (float): Seconds a query waits for others on the same grid.
+    """
+    service = PlannerService(workers, batch_window)
+    server = await service.start(host, port, path)
+    print(f"Serving on {path or f'{host}:{port}'} with {service.workers or 'no'} worker processes")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local path-planning service speaking JSON Lines.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, help="worker processes, 0 to search in the server process")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.batch_window))
+    except KeyboardInterrupt:
+        pass
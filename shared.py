@@ -0,0 +1,243 @@
+# shared.py
+
+import atexit
+import gc
+from collections import OrderedDict
+from multiprocessing import shared_memory
+import numpy as np
+from grid import Grid
+from search import Scratch
+
+ATTACHED_GRIDS = 8  # Shared grids each process keeps attached
+
+_attached = OrderedDict()  # Block name -> (Block, Grid), in each attaching process
+_released = []  # Blocks released while arrays still read them, closed once those arrays are gone
+_scratch = None  # Search buffers of this process, for the size of the last grid it searched
+
+
+class Block(shared_memory.SharedMemory):
+    """
+    A SharedMemory that stays quiet when the interpreter frees it before the arrays reading it.
+
+    That only happens while the interpreter shuts down, with grids still
+    referenced, and the mapping goes away with the process.
+    """
+
+    def __del__(self):
+        try:
+            self.close()
+        except (BufferError, OSError):
+            pass
+
+
+class SharedGrid:
+    """
+    A grid layout published once into a multiprocessing.shared_memory block.
+
+    The block holds the occupancy, followed by the costs when the grid has
+    any. Workers receive the small descriptor() instead of the grid and
+    attach() the block by name, so a layout is copied once however many
+    processes and queries use it. Searches keep their per-query state in
+    their own buffers, so only those are allocated in each worker.
+
+    The process that published the grid owns the block: close() it, or use
+    the SharedGrid as a context manager, once no worker needs it any more.
+
+    Attributes:
+        memory (Block): The block.
+        grid (Grid): A frozen grid reading from the block in this process.
+    """
+
+    def __init__(self, grid):
+        """
+        Copies a grid into a new shared memory block.
+
+        Args:
+            grid (Grid): The grid to publish.
+        """
+        layers = 1 if grid.costs is None else 2
+        self.memory = Block(create=True, size=max(1, grid.size * layers))
+        cells, costs = views(self.memory, grid.rows, grid.cols, grid.costs is not None)
+        cells[:] = grid.cells
+        if costs is not None:
+            costs[:] = grid.costs
+        self.grid = Grid(grid.rows, grid.cols, cells, costs).freeze()
+        self._descriptor = (self.memory.name, grid.rows, grid.cols, costs is not None, grid.fingerprint())
+        self.grid.derived("fingerprint", lambda _: self._descriptor[4])
+
+    def descriptor(self):
+        """
+        Gets the picklable description of the block that workers attach with.
+
+        Returns:
+            tuple: (name, rows, cols, has_costs, fingerprint).
+        """
+        return self._descriptor
+
+    def close(self):
+        """
+        Frees the block once no process maps it any more.
+
+        The name is removed at once, so no new worker can attach. Grids that
+        are still referenced in this process, including self.grid, keep
+        reading the same layout, and the mapping is closed by release() once
+        they are gone.
+        """
+        if self.memory is None:
+            return
+        self.grid = None
+        release(self.memory)
+        self.memory.unlink()
+        self.memory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def views(memory, rows, cols, has_costs):
+    """
+    Lays the occupancy and cost arrays over a shared memory block.
+
+    The arrays hold an export of the block's buffer, so the block cannot be
+    unmapped while any of them, or any view of them, is alive.
+
+    Args:
+        memory (Block): The block.
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+        has_costs (bool): True if the costs follow the occupancy.
+
+    Returns:
+        tuple: (cells, costs) (rows, cols) uint8 arrays, costs None without costs.
+    """
+    size = rows * cols
+    cells = np.frombuffer(memory.buf, dtype=np.uint8, count=size).reshape(rows, cols)
+    costs = None
+    if has_costs:
+        costs = np.frombuffer(memory.buf, dtype=np.uint8, count=size, offset=size).reshape(rows, cols)
+    return cells, costs
+
+
+def release(memory):
+    """
+    Closes this process's mapping of a block, as soon as no array reads it any more.
+
+    Grids form reference cycles with their derived values, so their arrays
+    may only be freed by the next garbage collection. A block whose arrays
+    are still referenced after it stays open, and it is closed by a later
+    release() or when the process exits, once they are gone.
+
+    Args:
+        memory (Block): The block.
+    """
+    _released.append(memory)
+    if not close_released():
+        gc.collect()
+        close_released()
+
+
+def close_released():
+    """
+    Closes the released blocks that no array reads any more.
+
+    Returns:
+        bool: True if every released block is closed.
+    """
+    for memory in list(_released):
+        try:
+            memory.close()
+        except BufferError:
+            continue  # Still exported to an array
+        _released.remove(memory)
+    return not _released
+
+
+def publish(grid):
+    """
+    Publishes a grid into shared memory.
+
+    Args:
+        grid (Grid): The grid.
+
+    Returns:
+        SharedGrid: The published grid; pass its descriptor() to the workers.
+    """
+    return SharedGrid(grid)
+
+
+def attach(descriptor):
+    """
+    Gets the grid of a shared memory block, attaching to it only the first time it is seen.
+
+    The grid stays attached for later calls, with its derived data such as
+    the component index, and the least recently used of more than
+    ATTACHED_GRIDS grids is detached.
+
+    Args:
+        descriptor (tuple): The value of SharedGrid.descriptor().
+
+    Returns:
+        Grid: A frozen grid reading from the block without a copy.
+    """
+    name, rows, cols, has_costs, fingerprint = descriptor
+    if name in _attached:
+        _attached.move_to_end(name)
+        return _attached[name][1]
+    try:
+        memory = Block(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching always registers the block with the resource tracker,
+        # which pool workers share with the publisher, so the block is still unlinked once
+        memory = Block(name=name)
+    grid = Grid(rows, cols, *views(memory, rows, cols, has_costs)).freeze()
+    grid.derived("fingerprint", lambda _: fingerprint)
+    _attached[name] = (memory, grid)
+    while len(_attached) > ATTACHED_GRIDS:
+        detach(next(iter(_attached)))
+    return grid
+
+
+def detach(name):
+    """
+    Detaches this process from a shared memory block attached with attach().
+
+    A grid attach() returned for it stays readable while it is referenced.
+
+    Args:
+        name (str): Name of the block.
+    """
+    entry = _attached.pop(name, None)
+    if entry is not None:
+        memory, grid = entry
+        del entry, grid
+        release(memory)
+
+
+@atexit.register
+def detach_all():
+    """
+    Detaches this process from every block it attached, such as when it exits.
+    """
+    for name in list(_attached):
+        detach(name)
+    gc.collect()
+    close_released()
+
+
+def scratch(size):
+    """
+    Gets the search buffers of this process, reused by every query on grids of one size.
+
+    Args:
+        size (int): Number of cells of the grid about to be searched.
+
+    Returns:
+        Scratch: Clean buffers for that size.
+    """
+    global _scratch
+    if _scratch is None or _scratch.size != size:
+        _scratch = Scratch(size)
+    return _scratch
@@ -0,0 +1,249 @@
+# sinks.py
+
+import atexit
+import csv
+import json
+import os
+from openpyxl import Workbook, load_workbook
+
+# Spreadsheet columns and the metrics keys they come from
+COLUMNS = [
+    ("Path", "path"),
+    ("Execution Time (s)", "time"),
+    ("Steps", "steps"),
+    ("Manhattan Distance", "manhattan_distance"),
+    ("Expanded Nodes", "expanded_nodes"),
+    ("Algorithm", "algorithm"),
+    ("Mode", "mode"),
+    ("Run", "run"),
+    ("Path Cost", "cost"),
+]
+HEADER = [title for title, _ in COLUMNS]
+
+
+def metrics_row(metrics):
+    """
+    Flattens a metrics dictionary into one spreadsheet row.
+
+    Args:
+        metrics (dict): The dictionary of metrics.
+
+    Returns:
+        list: The row values in COLUMNS order, with the path as a string.
+    """
+    row = [metrics.get(key) for _, key in COLUMNS]
+    row[0] = str(row[0])
+    return row
+
+
+class MetricsSink:
+    """
+    Buffers metrics in memory and writes them out in batches.
+
+    Subclasses implement write(), which receives a whole batch at once, and
+    may override close() to finalize the file.
+
+    Attributes:
+        filename (str): The file the metrics are written to.
+        batch_size (int): Number of buffered metrics that triggers a flush.
+        written (int): Number of metrics flushed so far.
+    """
+
+    def __init__(self, filename, batch_size=1000):
+        """
+        Initializes a MetricsSink.
+
+        Args:
+            filename (str): The file the metrics are written to.
+            batch_size (int): Number of buffered metrics that triggers a flush.
+        """
+        self.filename = filename
+        self.batch_size = batch_size
+        self.written = 0
+        self.buffer = []
+
+    def add(self, metrics):
+        """
+        Buffers one metrics dictionary, flushing when the batch is full.
+
+        Args:
+            metrics (dict): The dictionary of metrics to save.
+        """
+        self.buffer.append(metrics)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes every buffered metrics dictionary.
+        """
+        if self.buffer:
+            self.write(self.buffer)
+            self.written += len(self.buffer)
+            self.buffer = []
+
+    def write(self, batch):
+        """
+        Writes a batch of metrics.
+
+        Args:
+            batch (list): The metrics dictionaries to write.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Flushes the buffer and releases the file.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvSink(MetricsSink):
+    """
+    Streams metrics to a CSV file with the spreadsheet columns, appending to it if it exists.
+    """
+
+    def write(self, batch):
+        new_file = not os.path.exists(self.filename)
+        with open(self.filename, "a", newline="") as file:
+            writer = csv.writer(file)
+            if new_file:
+                writer.writerow(HEADER)
+            writer.writerows(metrics_row(metrics) for metrics in batch)
+
+
+class JsonlSink(MetricsSink):
+    """
+    Streams metrics to a JSON Lines file, one full metrics dictionary per line.
+    """
+
+    def write(self, batch):
+        with open(self.filename, "a") as file:
+            for metrics in batch:
+                file.write(json.dumps(metrics) + "\n")
+
+
+class ParquetSink(MetricsSink):
+    """
+    Streams metrics to a Parquet file, one row group per batch. Requires pyarrow.
+    """
+
+    def __init__(self, filename, batch_size=1000):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("ParquetSink requires pyarrow: pip install pyarrow") from e
+        super().__init__(filename, batch_size)
+        self.pyarrow = pyarrow
+        self.writer = None
+
+    def write(self, batch):
+        rows = [metrics_row(metrics) for metrics in batch]
+        columns = {key: [row[i] for row in rows] for i, (_, key) in enumerate(COLUMNS)}
+        table = self.pyarrow.table(columns)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.filename, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        super().close()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ExcelSink(MetricsSink):
+    """
+    Writes metrics to an .xlsx file through an openpyxl write-only workbook.
+
+    Rows are streamed into the sheet at every flush and the file is saved once,
+    on close, so a sweep never rewrites the workbook. An existing file is read
+    once, when the sink is opened: every sheet is copied in order, the new
+    rows are appended to its active sheet, and header titles missing from its
+    first row are filled in from HEADER. Only values are copied, not formatting.
+    """
+
+    def __init__(self, filename, batch_size=1000):
+        super().__init__(filename, batch_size)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        if os.path.exists(filename):
+            existing = load_workbook(filename, read_only=True)
+            active = existing.active.title
+            for index, source in enumerate(existing.worksheets):
+                sheet = self.workbook.create_sheet(source.title)
+                rows = source.iter_rows(values_only=True)
+                if source.title == active:
+                    self.sheet = sheet
+                    self.workbook.active = index
+                    first = list(next(rows, ()))
+                    first += [None] * (len(HEADER) - len(first))
+                    sheet.append([title if value is None else value for value, title in zip(first, HEADER)]
+                                 + first[len(HEADER):])
+                for row in rows:
+                    sheet.append(row)
+            existing.close()
+        if self.sheet is None:
+            self.sheet = self.workbook.create_sheet()
+            self.sheet.append(HEADER)
+
+    def write(self, batch):
+        for metrics in batch:
+            self.sheet.append(metrics_row(metrics))
+
+    def close(self):
+        super().close()
+        if self.workbook is not None:
+            self.workbook.save(self.filename)
+            self.workbook = None
+
+
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".parquet": ParquetSink,
+    ".xlsx": ExcelSink,
+}
+
+_open_sinks = {}
+
+
+def get_sink(filename, batch_size=None):
+    """
+    Gets the sink for a file, opening one picked by extension on first use.
+
+    Sinks opened here are closed, and so flushed, when the interpreter exits.
+
+    Args:
+        filename (str): The file to write to (.csv, .jsonl, .parquet or .xlsx).
+        batch_size (int): Number of buffered metrics that triggers a flush, the sink's own default if None.
+
+    Returns:
+        MetricsSink: The shared sink for that file.
+    """
+    sink = _open_sinks.get(filename)
+    if sink is None:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in SINKS:
+            raise ValueError(f"No metrics sink for '{extension}' files, use one of {sorted(SINKS)}")
+        options = {} if batch_size is None else {"batch_size": batch_size}
+        sink = _open_sinks[filename] = SINKS[extension](filename, **options)
+    return sink
+
+
+@atexit.register
+def close_all():
+    """
+    Closes every sink opened through get_sink().
+    """
+    while _open_sinks:
+        filename, sink = _open_sinks.popitem()
+        sink.close()
+        print(f"Metrics saved to {filename} ({sink.written} rows)")
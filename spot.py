@@ -23,9 +23,10 @@ class Spot:
         y (int): Pixel y-coordinate of the spot's top-left corner.
         color (tuple): Current color of the spot (default is WHITE).
         neighbors (list): List of neighboring spots.
+        changed (set): Optional set shared by the grid that the spot adds itself to when its color changes.
     """
 
-    def __init__(self, row, col, width, total_rows):
+    def __init__(self, row, col, width, total_rows, changed=None):
         """
         Initializes a Spot object.
 
@@ -34,6 +35,7 @@ class Spot:
             col (int): Column index of the spot.
             width (int): Width of the spot.
             total_rows (int): Total number of rows in the grid.
+            changed (set): Optional set to record color changes in, for redrawing only changed spots.
         """
         self.row = row
         self.col = col
@@ -41,8 +43,23 @@ class Spot:
         self.total_rows = total_rows
         self.x = row * width
         self.y = col * width
-        self.color = WHITE
+        self._color = WHITE
         self.neighbors = []
+        self.changed = changed
+
+    @property
+    def color(self):
+        """
+        tuple: Current color of the spot. Setting a new color records the spot in changed.
+        """
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        if value != self._color:
+            self._color = value
+            if self.changed is not None:
+                self.changed.add(self)
 
     def get_pos(self):
         """
@@ -98,6 +115,15 @@ class Spot:
         """
         return self.color == TURQUOISE
 
+    def is_path(self):
+        """
+        Checks if the spot is part of the final path.
+
+        Returns:
+            bool: True if the spot is on the path (PURPLE), False otherwise.
+        """
+        return self.color == PURPLE
+
     def reset(self):
         """
         Resets the spot's color to its default state (WHITE).